@@ -1,35 +1,66 @@
 """Game Controller Class"""
+import os
 import pygame
-from models import Game, Record, Leaderboard, Word, WordManager
+from models import Game, Record, Leaderboard, Word, WordManager, WordMatcher
 from views import Graphics
 
+# Longest frame the simulation catches up on; slower frames run the game in slow motion instead of
+# stalling on a long burst of steps
+MAX_FRAME_TIME = 0.25
+
+# Posted when a requested placement or the remote standings arrive, to wake the loop while it sleeps
+# on a static screen
+PLACEMENT_READY = pygame.event.custom_type()
+LEADERBOARD_READY = pygame.event.custom_type()
+
 class GameController():
     
-    def __init__(self):
+    def __init__(self, step_rate: int = 60, max_fps: int = 60, idle_timeout: float = 0.5):
+        """Create the Game. The simulation advances `step_rate` times per second however fast frames are drawn,
+        and frames are capped at `max_fps` (0 for uncapped). Outside of play, the loop sleeps until input
+        arrives, waking at least every `idle_timeout` seconds (None to keep running at `max_fps`)"""
         pygame.init()
         self.graphics = Graphics()
         self.clock = pygame.time.Clock()
         self.game: Game = None
-        self.leaderboard = Leaderboard()
+        # LEADERBOARD_SERVER=host:port shares one board between stations; otherwise scores stay local
+        server = os.environ.get("LEADERBOARD_SERVER")
+        if server:
+            from models.leaderboard_service import RemoteLeaderboard
+            self.leaderboard = RemoteLeaderboard.from_address(server, on_refresh=self.post_leaderboard_ready)
+        else:
+            self.leaderboard = Leaderboard()
         self.state = "menu"
         self.difficulty_multiplier = 1
         self.current_input_string = ""
-        self.word_manager = WordManager()
+        self.step_dt = 1.0 / step_rate
+        self.max_fps = max_fps
+        self.accumulator = 0.0  # frame time not yet consumed by simulation steps
+        self.idle_timeout = idle_timeout
+        self.placement = None  # rank of the last finished game, shown on the end and leaderboard screens
+        self.placement_request = None  # Future of the placement while it is being fetched
+        self.word_manager = WordManager(windowed=True)
 
     def main_loop(self):
         running = True
         pygame.key.start_text_input()
 
         self.graphics.render_main_menu(self.difficulty_multiplier)
-        pygame.display.update()
+        self.graphics.present()
 
         # Main Game Loop
         while running:
             
-            dtime = self.clock.tick(60) / 1000.0
+            # Pace the loop: at max_fps during play, otherwise sleep until input arrives
+            if self.state == "play" or self.idle_timeout is None:
+                dtime = min(self.clock.tick(self.max_fps) / 1000.0, MAX_FRAME_TIME)
+                events = pygame.event.get()
+            else:
+                dtime = 0.0
+                events = self.wait_for_events()
 
             # Global Event Handling
-            for event in pygame.event.get():
+            for event in events:
 
                 # Quit Game Event
                 if event.type == pygame.QUIT:
@@ -48,6 +79,15 @@ class GameController():
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     self.handle_click(self.graphics.check_button_clicked(event))
 
+                # Window Uncovered or Restored
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                    self.graphics.invalidate()
+
+            # Placement Arrived
+            if self.placement_request is not None and self.placement_request.done():
+                self.placement = self.placement_request.result()
+                self.placement_request = None
+
             # Render According to State
 
             # Main Menu State
@@ -56,14 +96,18 @@ class GameController():
             
             # Play State
             if self.state == "play":
-                self.game.update_time(-dtime)
-                self.graphics.move_platforms()
+                # Run whole fixed steps for the time that has passed, then draw between the last two
+                self.accumulator += dtime
+                while self.accumulator >= self.step_dt and not self.game.is_over():
+                    self.game.update_time(-self.step_dt)
+                    self.graphics.move_platforms(self.step_dt)
+                    self.accumulator -= self.step_dt
                 if self.game.is_over():
-                    self.state = "end"
+                    self.end_game()
                     self.current_input_string = ""
-                    self.graphics.render_end_game(self.game.score, self.current_input_string)
+                    self.graphics.render_end_game(self.game.score, self.current_input_string, self.placement)
                 else:
-                    self.graphics.render_game(self.game, self.current_input_string)
+                    self.graphics.render_game(self.game, self.current_input_string, self.accumulator / self.step_dt)
 
             # Pause State
             elif self.state == "pause":
@@ -71,21 +115,32 @@ class GameController():
 
             # Leaderboard State
             elif self.state == "leaderboard":
-                self.graphics.render_leaderboard(self.leaderboard.get_top_records())
+                self.graphics.render_leaderboard(self.leaderboard.get_top_records(), self.placement)
 
             # End Game State
             elif self.state == "end":
-                self.graphics.render_end_game(self.game.score, self.current_input_string) 
+                self.graphics.render_end_game(self.game.score, self.current_input_string, self.placement)
 
 
             # Update Display
-            pygame.display.update()
+            self.graphics.present()
 
         
         # Stop Text Input when Exiting Game
         pygame.key.stop_text_input()  
     
 
+    def wait_for_events(self) -> list[pygame.event.Event]:
+        """Block until an event arrives or `idle_timeout` passes, and return the pending events"""
+        # Static screens only change on input, so sleep instead of redrawing the same frame
+        event = pygame.event.wait(int(self.idle_timeout * 1000))
+        # Restart frame timing so play doesn't count the time spent idle
+        self.clock.tick()
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+
     def handle_key(self, key):
         """Handle Keystroke Events"""
         if key == pygame.K_ESCAPE:
@@ -103,17 +158,23 @@ class GameController():
         elif key == pygame.K_BACKSPACE:
             if self.state == "play" or self.state == "end":
                 self.current_input_string = self.current_input_string[:-1]
+            if self.state == "play":
+                self.game.matcher.pop()
     
 
     def handle_click(self, click):
         """Handle Mouse Click Events"""
         if click == "play":
+            self.current_input_string = ""
             self.start_game(self.difficulty_multiplier)
+            self.accumulator = 0.0
             self.word_manager.reset_progress()
             self.game.update_words(self.word_manager.get_three_cloud_words())
             self.graphics.init_game_elements(self.game.current_words)
             self.state = "play"
         elif click == "leaderboard":
+            self.placement = None
+            self.placement_request = None
             self.state = "leaderboard"
         elif click == "difficulty":
             self.difficulty_multiplier += 1
@@ -122,7 +183,7 @@ class GameController():
         elif click == "resume":
             self.state = "play"
         elif click == "end":
-            self.state = "end"
+            self.end_game()
         elif click == "close":
             self.state = "menu"
 
@@ -135,20 +196,15 @@ class GameController():
         # Check the buffer against the word options.
         self.current_input_string += text
 
+        # Advance the matcher by the typed characters instead of rescanning the whole buffer
+        if self.state == "play" or self.state == "pause":
+            status = self.game.matcher.feed(text)
+
         if self.state == "play":
-            print(f"Validating Input... {self.current_input_string}")
-            if self.game.validate_word(self.current_input_string):
+            if status == WordMatcher.MATCH:
                 # Use the matched word's configured score (apply game multiplier)
-                matched_word_obj = None
-                for w in self.game.current_words:
-                    if w.word == self.current_input_string:
-                        matched_word_obj = w
-                        break
-                if matched_word_obj is not None:
-                    score_value = int(matched_word_obj.score * self.game.multiplier)
-                else:
-                    # fallback to 10 if something unexpected happened
-                    score_value = 10
+                matched_word_obj = self.game.matcher.matched_word
+                score_value = int(matched_word_obj.score * self.game.multiplier)
                 self.game.update_score(score_value)
                 self.game.update_time(5.0)
                 # Fetch a fresh set of words from the (possibly updated) difficulty window
@@ -172,4 +228,26 @@ class GameController():
 
     def end_game(self):
         """End Game"""
-        self.state = "end"
\ No newline at end of file
+        self.state = "end"
+        # Fetched in the background; the end screen shows the placement once it arrives
+        self.placement = None
+        self.placement_request = self.leaderboard.request_rank(self.game.score)
+        self.placement_request.add_done_callback(self.post_placement_ready)
+
+
+    def post_placement_ready(self, _request):
+        """Wake the main loop once the placement arrives; may run on the leaderboard's thread"""
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(PLACEMENT_READY))
+
+
+    def post_leaderboard_ready(self):
+        """Wake the main loop once remote standings arrive; runs on the leaderboard's thread"""
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(LEADERBOARD_READY))
+
+
+    def shutdown(self):
+        """Flush pending leaderboard writes and release background resources before exiting"""
+        self.leaderboard.close()
+        self.word_manager.close()
\ No newline at end of file
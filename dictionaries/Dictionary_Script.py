@@ -1,8 +1,25 @@
 # Dictionary_Script.py
 # Parses cleaned.txt, assigns difficulty scores to words, and splits into 20 sub-dictionaries.
+# The sub-dictionaries are then compiled into subdicts.pack, which the game memory-maps at startup.
 
 import os
+import sys
 import math
+import json
+import heapq
+import struct
+import hashlib
+import inspect
+import argparse
+import tempfile
+from array import array
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+	import numpy as np
+except ImportError:  # NumPy is optional: fall back to the pure-Python scoring loop
+	np = None
 
 # QWERTY hand/finger mapping (simplified)
 LEFT_HAND = set('qwertasdfgzxcvb')
@@ -39,9 +56,111 @@ def score_word(word):
 		pair_score += pair_difficulty(word[i], word[i+1])
 	return base + pair_score
 
-def normalize_scores(raw_scores, min_score=100, max_score=5000):
-	raw_min = min(raw_scores)
-	raw_max = max(raw_scores)
+# --- Vectorized scoring (NumPy) ---
+# Words are scored in bulk by looking up every adjacent character pair in a precomputed
+# pair_difficulty matrix. The results are identical to score_word/normalize_scores.
+PAIR_TABLE_SIZE = 128  # ASCII; words with other characters are scored with score_word
+PARALLEL_MIN_WORDS = 200000  # below this, process start-up costs more than it saves
+
+def build_pair_matrix():
+	"""
+	Return a PAIR_TABLE_SIZE x PAIR_TABLE_SIZE array where [ord(a), ord(b)] == pair_difficulty(a, b).
+	"""
+	matrix = np.zeros((PAIR_TABLE_SIZE, PAIR_TABLE_SIZE), dtype=np.int64)
+	for a in range(PAIR_TABLE_SIZE):
+		for b in range(PAIR_TABLE_SIZE):
+			matrix[a, b] = pair_difficulty(chr(a), chr(b))
+	return matrix
+
+_PAIR_MATRIX = None
+
+def score_words_vectorized(words):
+	"""
+	Score a list of words with NumPy; equivalent to [score_word(w) for w in words].
+	"""
+	global _PAIR_MATRIX
+	if _PAIR_MATRIX is None:
+		_PAIR_MATRIX = build_pair_matrix()
+	scores = [0] * len(words)
+	ascii_idx = []
+	for i, word in enumerate(words):
+		if word.isascii():
+			ascii_idx.append(i)
+		else:
+			scores[i] = score_word(word)
+	if not ascii_idx:
+		return scores
+
+	ascii_words = [words[i] for i in ascii_idx]
+	codes = np.frombuffer(''.join(ascii_words).encode('ascii'), dtype=np.uint8)
+	lengths = np.fromiter((len(w) for w in ascii_words), dtype=np.int64, count=len(ascii_words))
+	ends = np.cumsum(lengths)
+	starts = ends - lengths
+
+	# pair k is (codes[k], codes[k+1]); pairs that straddle two words are zeroed out
+	pair_vals = _PAIR_MATRIX[codes[:-1], codes[1:]]
+	boundaries = ends[:-1] - 1
+	pair_vals[boundaries[boundaries >= 0]] = 0
+	pair_csum = np.concatenate(([0], np.cumsum(pair_vals)))
+	# a word spanning chars [s, e) owns pairs [s, e-1); empty words own none
+	pair_sums = np.where(lengths > 0, pair_csum[np.maximum(ends - 1, starts)] - pair_csum[starts], 0)
+	word_scores = 10 * lengths + pair_sums
+
+	for i, score in zip(ascii_idx, word_scores.tolist()):
+		scores[i] = score
+	return scores
+
+
+def _score_chunk(words):
+	if np is None:
+		return [score_word(word) for word in words]
+	return score_words_vectorized(words)
+
+
+def score_words(words, workers=None):
+	"""
+	Score every word, vectorized with NumPy when available and spread over a process pool for large inputs.
+	"""
+	if workers is None:
+		workers = os.cpu_count() or 1
+	if workers <= 1 or len(words) < PARALLEL_MIN_WORDS:
+		return _score_chunk(words)
+	chunk_size = math.ceil(len(words) / workers)
+	chunks = [words[i:i + chunk_size] for i in range(0, len(words), chunk_size)]
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		scores = []
+		for chunk_scores in pool.map(_score_chunk, chunks):
+			scores.extend(chunk_scores)
+	return scores
+
+
+def normalize_scores_vectorized(raw_scores, min_score=100, max_score=5000, raw_min=None, raw_max=None):
+	"""
+	NumPy version of normalize_scores; performs the same float64 operations, so results are identical.
+	"""
+	raw = np.asarray(raw_scores, dtype=np.int64)
+	if raw_min is None:
+		raw_min = int(raw.min())
+	if raw_max is None:
+		raw_max = int(raw.max())
+	if raw_max == raw_min:
+		vals = np.full(raw.shape, float(min_score))
+	else:
+		vals = min_score + ((raw - raw_min) / (raw_max - raw_min)) * (max_score - min_score)
+	# np.rint rounds half to even, like round()
+	return (np.rint(vals / 10.0) * 10).astype(np.int64).tolist()
+
+# --- End vectorized scoring ---
+
+def normalize_scores(raw_scores, min_score=100, max_score=5000, raw_min=None, raw_max=None):
+	"""
+	Map raw scores linearly onto [min_score, max_score], rounded to tens. raw_min/raw_max default to the
+	bounds of raw_scores; pass them to normalize one chunk of a larger corpus.
+	"""
+	if raw_min is None:
+		raw_min = min(raw_scores)
+	if raw_max is None:
+		raw_max = max(raw_scores)
 	normed = []
 	for s in raw_scores:
 		if raw_max == raw_min:
@@ -69,18 +188,84 @@ def load_bad_words(path=None):
 	return words
 
 
-def clean_subdict_files(bad_words, make_backup=True):
+class BadWordFilter:
+	"""
+	Multi-pattern matcher over a bad-word list, built once and then applied per word in time linear
+	in the word's length:
+	- an Aho-Corasick automaton finds any bad word contained in the word;
+	- a set of every substring of the bad words finds words contained in a bad word.
+	"""
+	def __init__(self, bad_words):
+		# Trie of the bad words: goto transitions, failure links and whether a bad word ends at (or below) a state
+		self.goto = [{}]
+		self.fail = [0]
+		self.out = [False]
+		for bad in bad_words:
+			state = 0
+			for ch in bad:
+				nxt = self.goto[state].get(ch)
+				if nxt is None:
+					nxt = len(self.goto)
+					self.goto[state][ch] = nxt
+					self.goto.append({})
+					self.fail.append(0)
+					self.out.append(False)
+				state = nxt
+			self.out[state] = True
+		# Breadth-first pass to set failure links; a state matches if its failure state matches
+		queue = list(self.goto[0].values())
+		for state in queue:
+			for ch, nxt in self.goto[state].items():
+				f = self.fail[state]
+				while f and ch not in self.goto[f]:
+					f = self.fail[f]
+				self.fail[nxt] = self.goto[f].get(ch, 0)
+				self.out[nxt] = self.out[nxt] or self.out[self.fail[nxt]]
+				queue.append(nxt)
+		# '' is contained in every bad word, matching the original `word in b` check
+		self.substrings = {''} if bad_words else set()
+		for bad in bad_words:
+			for i in range(len(bad)):
+				for j in range(i + 1, len(bad) + 1):
+					self.substrings.add(bad[i:j])
+
+	def matches(self, word):
+		"""
+		True if word contains a bad word or is contained in one (same as any(b in word or word in b ...)).
+		"""
+		if word in self.substrings:
+			return True
+		state = 0
+		for ch in word:
+			while state and ch not in self.goto[state]:
+				state = self.fail[state]
+			state = self.goto[state].get(ch, 0)
+			if self.out[state]:
+				return True
+		return False
+
+
+def clean_subdict_files(bad_words, make_backup=True, dirpath=None, manifest=None):
 	"""
 	Remove lines from subdict_*.txt files whose word (left of '|') matches or contains any entry
 	in bad_words. Matching is case-insensitive and strips whitespace. Optionally makes a .bak backup.
+	With a build manifest, files already cleaned with the same bad-word list are skipped without
+	being re-read: the manifest records each cleaned file's size and modification time, and a file
+	whose stat still matches is left alone.
 	"""
 	if not bad_words:
 		return
-	dirpath = os.path.dirname(__file__)
+	bad_filter = BadWordFilter(bad_words)
+	if dirpath is None:
+		dirpath = os.path.dirname(__file__)
+	bad_hash = _text_hash('\n'.join(sorted(bad_words)))
+	cleaned_with = manifest.setdefault('cleaned', {}) if manifest is not None else {}
 	for filename in os.listdir(dirpath):
 		if not (filename.startswith('subdict_') and filename.endswith('.txt')):
 			continue
 		path = os.path.join(dirpath, filename)
+		if manifest is not None and cleaned_with.get(filename) == [bad_hash, *file_stat_key(path)]:
+			continue
 		with open(path, 'r', encoding='utf-8') as fh:
 			lines = fh.readlines()
 		cleaned = []
@@ -92,7 +277,7 @@ def clean_subdict_files(bad_words, make_backup=True):
 			parts = ln_strip.split('|', 1)
 			word = parts[0].strip().lower()
 			# remove if exact match or contains a bad token as a substring
-			if any(b in word or word in b for b in bad_words):
+			if bad_filter.matches(word):
 				removed += 1
 			else:
 				cleaned.append(ln_strip + '\n')
@@ -105,24 +290,281 @@ def clean_subdict_files(bad_words, make_backup=True):
 			with open(path, 'w', encoding='utf-8') as fh:
 				fh.writelines(cleaned)
 			print(f"[Dictionary_Script] Cleaned {removed} entries from {filename}")
+		if manifest is not None:
+			cleaned_with[filename] = [bad_hash, *file_stat_key(path)]
 
 # --- End new utilities ---
 
-def main():
-	# Try to load a bad_words.txt (create this file next to Dictionary_Script.py with one word per line)
-	bad_words = load_bad_words()
-	# If any bad words were provided, clean subdict files and exit without regenerating files
-	if bad_words:
-		clean_subdict_files(bad_words)
-		print('[Dictionary_Script] Completed cleaning subdict files. Exiting without regenerating subdict files.')
-		return
+# --- Compiled dictionary pack ---
+# Layout must match models/dictionary_pack.py (all values little-endian):
+#   header | level table (first, count) | word byte offsets (u32) | scores (u16) | UTF-8 word blob
+PACK_MAGIC = b'TUDP'
+PACK_VERSION = 1
+PACK_FILENAME = 'subdicts.pack'
+PACK_HEADER = struct.Struct('<4sHHIIIIII')
+PACK_LEVEL_ENTRY = struct.Struct('<II')
+
+def read_subdict_file(path):
+	"""
+	Read (word, score) pairs from a subdict file, with the same rules the game uses when loading text files.
+	"""
+	entries = []
+	if not os.path.isfile(path):
+		return entries
+	with open(path, 'r', encoding='utf-8') as fh:
+		for line in fh:
+			line = line.strip()
+			if not line:
+				continue
+			if '|' in line:
+				word, score = line.split('|', 1)
+				try:
+					entries.append((word, int(score)))
+				except ValueError:
+					continue
+			else:
+				entries.append((line, 0))
+	return entries
+
+
+def write_pack(levels, out_path):
+	"""
+	Write a dictionary pack from a list of levels, each a list of (word, score) pairs.
+	Scores must fit in an unsigned 16-bit integer.
+	"""
+	level_table = []
+	offsets = array('I', [0])
+	scores = array('H')
+	blob = bytearray()
+	for entries in levels:
+		level_table.append((len(scores), len(entries)))
+		for word, score in entries:
+			if not 0 <= score <= 0xFFFF:
+				raise ValueError(f'score {score} for {word!r} does not fit in a dictionary pack')
+			blob += word.encode('utf-8')
+			offsets.append(len(blob))
+			scores.append(score)
+	if len(blob) > 0xFFFFFFFF:
+		raise ValueError('word blob is too large for a dictionary pack')
+	if sys.byteorder != 'little':
+		offsets.byteswap()
+		scores.byteswap()
+
+	levels_pos = PACK_HEADER.size
+	offsets_pos = levels_pos + PACK_LEVEL_ENTRY.size * len(level_table)
+	scores_pos = offsets_pos + 4 * len(offsets)
+	blob_pos = scores_pos + 2 * len(scores)
+	header = PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(level_table), len(scores),
+		levels_pos, offsets_pos, scores_pos, blob_pos, len(blob))
+
+	tmp_path = out_path + '.tmp'
+	with open(tmp_path, 'wb') as out:
+		out.write(header)
+		for first, count in level_table:
+			out.write(PACK_LEVEL_ENTRY.pack(first, count))
+		out.write(offsets.tobytes())
+		out.write(scores.tobytes())
+		out.write(blob)
+	os.replace(tmp_path, out_path)
+
+
+def compile_pack(dirpath=None, out_path=None):
+	"""
+	Compile subdict_01.txt..subdict_20.txt into a single dictionary pack next to them.
+	"""
+	if dirpath is None:
+		dirpath = os.path.dirname(__file__)
+	if out_path is None:
+		out_path = os.path.join(dirpath, PACK_FILENAME)
+	levels = [read_subdict_file(os.path.join(dirpath, f'subdict_{i:02d}.txt')) for i in range(1, 21)]
+	write_pack(levels, out_path)
+	print(f"[Dictionary_Script] Wrote {sum(len(l) for l in levels)} words to {out_path}")
+
+# --- End compiled dictionary pack ---
+
+# --- Build manifest ---
+# build_manifest.json records hashes of the corpus, the scoring tables and every output, so a rebuild
+# can skip unchanged work: words already in score_cache.tsv are not rescored, sub-dictionaries whose
+# contents did not change are not rewritten, and the pack is only recompiled when a subdict changed.
+MANIFEST_FILENAME = 'build_manifest.json'
+SCORE_CACHE_FILENAME = 'score_cache.tsv'
+
+def _text_hash(text):
+	return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def file_stat_key(path):
+	"""
+	(size, mtime in ns) of a file, which changes whenever the file is rewritten.
+	"""
+	st = os.stat(path)
+	return [st.st_size, st.st_mtime_ns]
+
+
+def file_sha256(path):
+	"""
+	SHA-256 of a file's contents, or None if it does not exist.
+	"""
+	if not os.path.isfile(path):
+		return None
+	digest = hashlib.sha256()
+	with open(path, 'rb') as fh:
+		for block in iter(lambda: fh.read(1 << 20), b''):
+			digest.update(block)
+	return digest.hexdigest()
+
+
+def scoring_fingerprint():
+	"""
+	Hash of everything that affects raw scores: the key tables and the scoring functions' source.
+	"""
+	tables = [sorted(LEFT_HAND), sorted(RIGHT_HAND), sorted(HOME_ROW), sorted(PINKY_RING), sorted(COMMON_DIGRAPHS)]
+	parts = [json.dumps(tables)]
+	for fn in (pair_difficulty, score_word):
+		try:
+			parts.append(inspect.getsource(fn))
+		except (OSError, TypeError):
+			parts.append(fn.__name__)
+	return _text_hash('\n'.join(parts))
+
+
+def load_manifest(dirpath=None):
+	if dirpath is None:
+		dirpath = os.path.dirname(__file__)
+	path = os.path.join(dirpath, MANIFEST_FILENAME)
+	try:
+		with open(path, 'r', encoding='utf-8') as fh:
+			return json.load(fh)
+	except (OSError, ValueError):
+		return {}
+
+
+def save_manifest(manifest, dirpath=None):
+	if dirpath is None:
+		dirpath = os.path.dirname(__file__)
+	path = os.path.join(dirpath, MANIFEST_FILENAME)
+	with open(path + '.tmp', 'w', encoding='utf-8') as fh:
+		json.dump(manifest, fh, indent=1, sort_keys=True)
+	os.replace(path + '.tmp', path)
+
+
+def load_score_cache(dirpath, scoring_hash):
+	"""
+	Load the word -> raw score cache if it was produced with the current scoring tables.
+	"""
+	path = os.path.join(dirpath, SCORE_CACHE_FILENAME)
+	cache = {}
+	if not os.path.isfile(path):
+		return cache
+	with open(path, 'r', encoding='utf-8') as fh:
+		if fh.readline().rstrip('\n') != scoring_hash:
+			return cache
+		for line in fh:
+			word, _, score = line.rstrip('\n').rpartition('\t')
+			cache[word] = int(score)
+	return cache
+
+
+def save_score_cache(dirpath, scoring_hash, cache):
+	path = os.path.join(dirpath, SCORE_CACHE_FILENAME)
+	with open(path + '.tmp', 'w', encoding='utf-8') as fh:
+		fh.write(scoring_hash + '\n')
+		fh.writelines(f'{word}\t{score}\n' for word, score in cache.items())
+	os.replace(path + '.tmp', path)
+
+
+def score_words_cached(words, cache):
+	"""
+	Score words, reusing and filling a word -> raw score cache; only unseen words are scored.
+	"""
+	missing = [w for w in dict.fromkeys(words) if w not in cache]
+	if missing:
+		cache.update(zip(missing, score_words(missing)))
+	print(f"[Dictionary_Script] Scored {len(missing)} new words, reused cached scores for the rest")
+	return [cache[w] for w in words]
+
+
+def replace_if_changed(tmp_path, path):
+	"""
+	Move tmp_path over path unless both have the same contents. Returns True if path was rewritten.
+	"""
+	if file_sha256(tmp_path) == file_sha256(path):
+		os.remove(tmp_path)
+		return False
+	os.replace(tmp_path, path)
+	return True
+
+
+def write_subdict(out_path, pairs, bad_filter=None):
+	"""
+	Write (word, score) pairs as out_path, dropping words bad_filter matches the way
+	clean_subdict_files would, and replace the file only if its contents changed.
+	"""
+	with open(out_path + '.tmp', 'w', encoding='utf-8') as out:
+		for word, score in pairs:
+			if bad_filter is None or not bad_filter.matches(word.lower()):
+				out.write(f'{word}|{score}\n')
+	if replace_if_changed(out_path + '.tmp', out_path):
+		print(f"[Dictionary_Script] Rewrote {os.path.basename(out_path)}")
+
+
+def outputs_match_manifest(manifest, dirpath):
+	"""
+	True if every subdict file still has the hash recorded in the manifest.
+	"""
+	outputs = manifest.get('outputs', {})
+	return len(outputs) == 20 and all(
+		file_sha256(os.path.join(dirpath, name)) == digest for name, digest in outputs.items())
+
+
+def record_outputs(manifest, dirpath):
+	manifest['outputs'] = {
+		f'subdict_{i:02d}.txt': file_sha256(os.path.join(dirpath, f'subdict_{i:02d}.txt')) for i in range(1, 21)}
+
 
-	input_path = os.path.join(os.path.dirname(__file__), 'cleaned.txt')
+def compile_pack_if_changed(manifest, dirpath=None):
+	"""
+	Recompile the dictionary pack only if the subdict files changed since it was last compiled.
+	"""
+	if dirpath is None:
+		dirpath = os.path.dirname(__file__)
+	inputs = _text_hash(''.join(
+		file_sha256(os.path.join(dirpath, f'subdict_{i:02d}.txt')) or '-' for i in range(1, 21)))
+	pack_path = os.path.join(dirpath, PACK_FILENAME)
+	if manifest.get('pack_inputs') == inputs and file_sha256(pack_path) == manifest.get('pack'):
+		print('[Dictionary_Script] Dictionary pack is up to date')
+		return False
+	compile_pack(dirpath, pack_path)
+	manifest['pack_inputs'] = inputs
+	manifest['pack'] = file_sha256(pack_path)
+	return True
+
+# --- End build manifest ---
+
+def _normalize_chunk(raw_scores, raw_min, raw_max):
+	if np is not None:
+		return normalize_scores_vectorized(raw_scores, raw_min=raw_min, raw_max=raw_max)
+	return normalize_scores(raw_scores, raw_min=raw_min, raw_max=raw_max)
+
+
+def build_subdicts(input_path, out_dir, score_cache=None, bad_words=None):
+	"""
+	Score every word of input_path in memory and split them by score into the 20 subdict files.
+	With a score_cache (word -> raw score), only words missing from it are scored. Words matching
+	bad_words are left out, so the files come out already cleaned.
+	Subdict files whose contents are unchanged are left untouched.
+	"""
 	with open(input_path, 'r', encoding='utf-8') as f:
 		words = [line.strip() for line in f if line.strip()]
 
-	raw_scores = [score_word(word) for word in words]
-	normed_scores = normalize_scores(raw_scores)
+	if score_cache is None:
+		raw_scores = score_words(words)
+	else:
+		raw_scores = score_words_cached(words, score_cache)
+	if np is not None:
+		normed_scores = normalize_scores_vectorized(raw_scores)
+	else:
+		normed_scores = normalize_scores(raw_scores)
 
 	word_score_pairs = list(zip(words, normed_scores))
 	word_score_pairs.sort(key=lambda x: x[1])
@@ -130,12 +572,133 @@ def main():
 	# Split into 20 sub-dictionaries
 	n = len(word_score_pairs)
 	chunk_size = math.ceil(n / 20)
+	bad_filter = BadWordFilter(bad_words) if bad_words else None
 	for i in range(20):
 		chunk = word_score_pairs[i*chunk_size:(i+1)*chunk_size]
-		out_path = os.path.join(os.path.dirname(__file__), f'subdict_{i+1:02d}.txt')
-		with open(out_path, 'w', encoding='utf-8') as out:
-			for word, score in chunk:
-				out.write(f'{word}|{score}\n')
+		write_subdict(os.path.join(out_dir, f'subdict_{i+1:02d}.txt'), chunk, bad_filter)
+
+# --- Streaming rebuild (external sort) ---
+STREAM_CHUNK_WORDS = 200000
+
+def _read_corpus_chunks(input_path, chunk_words):
+	"""
+	Yield lists of at most chunk_words stripped, non-empty lines of input_path.
+	"""
+	with open(input_path, 'r', encoding='utf-8') as f:
+		words = (line.strip() for line in f)
+		words = (w for w in words if w)
+		while True:
+			chunk = list(islice(words, chunk_words))
+			if not chunk:
+				return
+			yield chunk
+
+
+def _read_run(path):
+	"""
+	Yield (score, seq, word) from a sorted run file.
+	"""
+	with open(path, 'r', encoding='utf-8') as fh:
+		for line in fh:
+			score, seq, word = line.rstrip('\n').split('|', 2)
+			yield int(score), int(seq), word
+
+
+def build_subdicts_streaming(input_path, out_dir, chunk_words=STREAM_CHUNK_WORDS, bad_words=None):
+	"""
+	Same output as build_subdicts, but with memory bounded by chunk_words instead of the corpus size:
+	1. score the corpus chunk by chunk, spilling raw scores to disk and keeping a running min/max;
+	2. normalize each chunk with the global min/max, sort it and spill it as a sorted run;
+	3. k-way merge the runs by (score, input position) straight into the 20 subdict files.
+	Sorting by input position on ties reproduces the stable in-memory sort exactly.
+	"""
+	with tempfile.TemporaryDirectory(prefix='subdict_build_') as tmp:
+		# Pass 1: raw scores and bounds
+		raw_path = os.path.join(tmp, 'raw_scores.bin')
+		n = 0
+		raw_min = raw_max = None
+		with open(raw_path, 'wb') as raw_out:
+			for chunk in _read_corpus_chunks(input_path, chunk_words):
+				raw = score_words(chunk)
+				array('q', raw).tofile(raw_out)
+				n += len(raw)
+				raw_min = min(raw) if raw_min is None else min(raw_min, min(raw))
+				raw_max = max(raw) if raw_max is None else max(raw_max, max(raw))
+
+		# Pass 2: sorted runs of normalized scores
+		run_paths = []
+		seq = 0
+		with open(raw_path, 'rb') as raw_in:
+			for chunk in _read_corpus_chunks(input_path, chunk_words):
+				raw = array('q')
+				raw.fromfile(raw_in, len(chunk))
+				normed = _normalize_chunk(raw.tolist(), raw_min, raw_max)
+				run = sorted(zip(normed, range(seq, seq + len(chunk)), chunk), key=lambda x: x[0])
+				seq += len(chunk)
+				run_path = os.path.join(tmp, f'run_{len(run_paths):05d}.txt')
+				with open(run_path, 'w', encoding='utf-8') as out:
+					out.writelines(f'{score}|{i}|{word}\n' for score, i, word in run)
+				run_paths.append(run_path)
+				del run, normed, raw
+
+		# Merge: runs are sorted by (score, seq), so heapq.merge yields the global order lazily
+		chunk_size = math.ceil(n / 20)
+		merged = heapq.merge(*(_read_run(p) for p in run_paths), key=lambda x: (x[0], x[1]))
+		bad_filter = BadWordFilter(bad_words) if bad_words else None
+		for i in range(20):
+			pairs = ((word, score) for score, _, word in islice(merged, chunk_size))
+			write_subdict(os.path.join(out_dir, f'subdict_{i+1:02d}.txt'), pairs, bad_filter)
+		print(f"[Dictionary_Script] Streamed {n} words through {len(run_paths)} sorted runs")
+
+# --- End streaming rebuild ---
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Score cleaned.txt into 20 sub-dictionaries and compile the dictionary pack.')
+	parser.add_argument('--rebuild', action='store_true',
+		help='regenerate the subdict files from cleaned.txt before cleaning them (implied by --stream and --force)')
+	parser.add_argument('--stream', action='store_true',
+		help='rebuild with bounded memory by scoring in chunks and merging sorted runs from disk')
+	parser.add_argument('--chunk-words', type=int, default=STREAM_CHUNK_WORDS,
+		help='words per chunk in --stream mode (default: %(default)s)')
+	parser.add_argument('--force', action='store_true',
+		help='ignore the build manifest and rebuild everything')
+	args = parser.parse_args(argv)
+
+	dirpath = os.path.dirname(__file__)
+	manifest = {} if args.force else load_manifest(dirpath)
+
+	# Try to load a bad_words.txt (create this file next to Dictionary_Script.py with one word per line)
+	bad_words = load_bad_words()
+	# If bad words were provided and no rebuild was asked for, only clean the existing subdict files
+	if bad_words and not (args.rebuild or args.stream or args.force):
+		clean_subdict_files(bad_words, manifest=manifest)
+		compile_pack_if_changed(manifest, dirpath)
+		save_manifest(manifest, dirpath)
+		print('[Dictionary_Script] Completed cleaning subdict files. Pass --rebuild to regenerate them from cleaned.txt.')
+		return
+
+	input_path = os.path.join(dirpath, 'cleaned.txt')
+	corpus_hash = file_sha256(input_path)
+	scoring_hash = scoring_fingerprint()
+	if (manifest.get('corpus') == corpus_hash and manifest.get('scoring') == scoring_hash
+			and outputs_match_manifest(manifest, dirpath)):
+		print('[Dictionary_Script] Corpus, scoring tables and subdict files are unchanged; skipping rebuild')
+	elif args.stream:
+		build_subdicts_streaming(input_path, dirpath, max(1, args.chunk_words), bad_words)
+	else:
+		score_cache = load_score_cache(dirpath, scoring_hash)
+		build_subdicts(input_path, dirpath, score_cache, bad_words)
+		# keep only the current corpus' words in the cache
+		with open(input_path, 'r', encoding='utf-8') as f:
+			current = {line.strip() for line in f if line.strip()}
+		save_score_cache(dirpath, scoring_hash, {w: s for w, s in score_cache.items() if w in current})
+	# The builds already left the bad words out; this only records the files as cleaned
+	clean_subdict_files(bad_words, make_backup=False, dirpath=dirpath, manifest=manifest)
+	manifest['corpus'] = corpus_hash
+	manifest['scoring'] = scoring_hash
+	record_outputs(manifest, dirpath)
+	compile_pack_if_changed(manifest, dirpath)
+	save_manifest(manifest, dirpath)
 
 
 if __name__ == '__main__':
@@ -7,4 +7,5 @@ if __name__ == "__main__":
     game_controller = GameController()
     game_controller.main_loop()
     print("Main Loop Ended. Game Exiting...")
+    game_controller.shutdown()
     pygame.quit()
\ No newline at end of file
@@ -1,11 +1,16 @@
 # -*- mode: python ; coding: utf-8 -*-
+import glob
 
+# Bundle the compiled dictionary pack when it has been built (python dictionaries/Dictionary_Script.py)
+dictionary_datas = [('dictionaries/*.txt', 'dictionaries')]
+if glob.glob('dictionaries/*.pack'):
+    dictionary_datas.append(('dictionaries/*.pack', 'dictionaries'))
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('assets', 'assets'), ('dictionaries/*.txt', 'dictionaries')],
+    datas=[('assets', 'assets')] + dictionary_datas,
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -1,7 +1,11 @@
 """Model Module Definition"""
 from .dictionary import Dictionary
+from .dictionary_pack import DictionaryPack
 from .game import Game
 from .leaderboard import Leaderboard
 from .record import Record
+from .score_index import ScoreIndex
+from .word_store import WordColumn
 from .word_manager import WordManager
+from .word_matcher import WordMatcher
 from .word import Word
@@ -0,0 +1,102 @@
+"""Dictionary Pack Class
+
+A dictionary pack is a single binary file that holds every sub-dictionary, produced by
+`dictionaries/Dictionary_Script.py`. Loading it only memory-maps the file; words are decoded
+from the blob when they are sampled instead of parsing every `word|score` line at startup.
+
+Layout (little-endian; must match `write_pack` in `Dictionary_Script.py`):
+- header: magic, version, level count, word count and the byte position of each section
+- level table: `(first_word, word_count)` per level
+- offset table: `word_count + 1` byte offsets into the word blob
+- score array: one unsigned 16-bit score per word
+- word blob: every word concatenated as UTF-8
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import Sequence
+
+from .word_store import WordColumn
+
+PACK_MAGIC = b"TUDP"
+PACK_VERSION = 1
+PACK_FILENAME = "subdicts.pack"
+
+# magic, version, num_levels, num_words, levels_pos, offsets_pos, scores_pos, blob_pos, blob_size
+HEADER = struct.Struct("<4sHHIIIIII")
+LEVEL_ENTRY = struct.Struct("<II")
+
+
+class DictionaryPack:
+    """Memory-mapped dictionary pack exposing one `WordColumn` per sub-dictionary."""
+
+    def __init__(self, path: str):
+        """Open and validate the pack at `path`.
+
+        Raises:
+            OSError: if the file cannot be opened or mapped.
+            ValueError: if the file is not a pack of a supported version.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _parse(self) -> None:
+        mm = self._mm
+        if len(mm) < HEADER.size:
+            raise ValueError(f"{self.path} is too small to be a dictionary pack")
+        (magic, version, num_levels, num_words,
+         levels_pos, offsets_pos, scores_pos, blob_pos, blob_size) = HEADER.unpack_from(mm, 0)
+        if magic != PACK_MAGIC:
+            raise ValueError(f"{self.path} is not a dictionary pack")
+        if version != PACK_VERSION:
+            raise ValueError(f"unsupported dictionary pack version {version}")
+        if blob_pos + blob_size > len(mm):
+            raise ValueError(f"{self.path} is truncated")
+
+        view = memoryview(mm)
+        self._views = [view]
+        self.levels = [LEVEL_ENTRY.unpack_from(mm, levels_pos + k * LEVEL_ENTRY.size) for k in range(num_levels)]
+        self.num_words = num_words
+        self._offsets = self._column(view, "I", offsets_pos, num_words + 1)
+        self._scores = self._column(view, "H", scores_pos, num_words)
+        self._blob = view[blob_pos:blob_pos + blob_size]
+        self._views.append(self._blob)
+
+    def _column(self, view: memoryview, typecode: str, pos: int, count: int) -> Sequence[int]:
+        """Return a typed column of the pack without copying it when the host is little-endian."""
+        itemsize = array(typecode).itemsize
+        raw = view[pos:pos + count * itemsize]
+        if sys.byteorder == "little":
+            column = raw.cast(typecode)
+            self._views.extend((raw, column))
+            return column
+        copy = array(typecode)
+        copy.frombytes(raw)
+        copy.byteswap()
+        raw.release()
+        return copy
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def level(self, idx: int) -> WordColumn:
+        """Return the 0-based level `idx` as a `WordColumn` over the mapped buffers."""
+        first, count = self.levels[idx]
+        return WordColumn(self._blob, self._offsets, self._scores, first, count)
+
+    def close(self) -> None:
+        """Release the memory map. Levels returned earlier must not be used afterwards."""
+        for v in reversed(self._views):
+            v.release()
+        self._views = []
+        self._mm.close()
@@ -1,5 +1,6 @@
 """Game class"""
 from .word import Word
+from .word_matcher import WordMatcher
 
 class Game():
     def __init__(self, difficulty_multiplier: int):
@@ -7,6 +8,7 @@ class Game():
         self.multiplier = difficulty_multiplier
         self.remaining_time = 30.0
         self.current_words = []
+        self.matcher = WordMatcher()
 
 
     def is_over(self) -> bool:
@@ -22,16 +24,13 @@ class Game():
 
     def validate_word(self, input: str) -> bool:
         """Validate Input against Current Words"""
-        for word in self.current_words:
-            print(f"validating {input} against {word.word}")
-            if input == word.word:
-                return True
-        return False
+        return self.matcher.match(input) is not None
     
 
     def update_words(self, words: list[Word]):
         """Temp Function For Prototype to get new words"""
         self.current_words = words
+        self.matcher.reset(words)
 
 
     def update_score(self, value: int):
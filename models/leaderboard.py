@@ -1,46 +1,357 @@
 """Leaderboard Class"""
+import queue
 import sqlite3
+import threading
+from array import array
+from bisect import bisect_right, insort
+from concurrent.futures import Future
+from itertools import islice
+from typing import Iterable, Iterator, Optional
 from .record import Record
 
+# Schema migrations, applied in order. The database's PRAGMA user_version holds how many have run,
+# so databases created before versioning (user_version 0) are upgraded in place.
+MIGRATIONS = [
+    # 1: records table, plus a descending score index that also covers username.
+    # Standings, paging and rank counts are all answered from the index without touching the table.
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_records_score ON records (score DESC, id, username)',
+    ],
+    # 2: index on (username, score, timestamp), so imports and merges can find rows already present.
+    # Not unique: timestamps have one-second resolution, so two real games can share all three.
+    [
+        'CREATE INDEX IF NOT EXISTS idx_records_identity ON records (username, score, timestamp)',
+    ],
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+LOAD_SCORES = object()  # queued to make the writer thread (re)load the sorted scores used by rank_of
+
+IMPORT_CACHE_SIZE = -65536  # page cache used while importing, in KiB when negative
+
+# SQLite stores integers as signed 64-bit values
+MIN_SCORE = -(1 << 63)
+MAX_SCORE = (1 << 63) - 1
+
+
 class Leaderboard():
-    def __init__(self, db_path: str = "leaderboard.db"):
+    def __init__(self, db_path: str = "leaderboard.db", cache_size: int = 10):
         """Initialize Leaderboard with SQLite Database"""
         self.db_path = db_path
+        self.cache_size = cache_size
+        self._top: list[Record] = None  # top `cache_size` records, highest score first
+        self._scores: Optional[array] = None  # every score in ascending order, loaded by the writer thread
+        self._unloaded: list[int] = []  # scores added while _scores is being loaded
+        self._scores_lock = threading.Lock()
+        self._scores_ready = threading.Event()
+        # One connection for the lifetime of the leaderboard, in autocommit mode so transactions are explicit
+        self._conn = sqlite3.connect(db_path, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
         self.init_database()
-    
+        # Read before anything is queued, so showing the standings never waits on the writer thread
+        self._top = self._read_page(cache_size)[0]
+        # Inserts are queued and written in batches by a background thread, off the render loop
+        self._pending: queue.Queue = queue.Queue()
+        self._pending.put(LOAD_SCORES)
+        self._writer = threading.Thread(target=self._write_loop, name="leaderboard-writer", daemon=True)
+        self._writer.start()
+
     def init_database(self):
-        """Initialize Database Table if it doesn't exist"""
-        conn = sqlite3.connect(self.db_path)
-        navigate = conn.cursor()
-        navigate.execute('''
-            CREATE TABLE IF NOT EXISTS records (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL,
-                score INTEGER NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        conn.commit()
-        conn.close()
-    
+        """Create or upgrade the Database schema to SCHEMA_VERSION"""
+        current = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        for version in range(current, SCHEMA_VERSION):
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                for statement in MIGRATIONS[version]:
+                    self._conn.execute(statement)
+                self._conn.execute(f'PRAGMA user_version = {version + 1}')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+
+    def close(self):
+        """Write any queued Records, then stop the writer thread and close the Database"""
+        if self._conn is None:
+            return
+        self._pending.put(None)
+        self._writer.join()
+        self._conn.close()
+        self._conn = None
+
+    def flush(self):
+        """Block until every queued Record has been written"""
+        self._pending.join()
+
     def add_record(self, record: Record):
-        """Add Record to Database"""
-        conn = sqlite3.connect(self.db_path)
-        navigate = conn.cursor()
-        navigate.execute('INSERT INTO records (username, score) VALUES (?, ?)', (record.username, record.score))
-        conn.commit()
+        """Queue Record for writing and add it to the cached standings immediately"""
+        self.add_records([record])
+
+    def add_records(self, records: Iterable[Record]):
+        """Queue many Records to be written in a single transaction.
+
+        Raises ValueError, before anything is queued, if a score is not an integer SQLite can store.
+        """
+        records = list(records)
+        for record in records:
+            if not isinstance(record.score, int) or not MIN_SCORE <= record.score <= MAX_SCORE:
+                raise ValueError(f"Score out of range: {record.score!r}")
+        for record in records:
+            self._cache_insert(record)
+        with self._scores_lock:
+            for record in records:
+                if self._scores is not None:
+                    # A binary search plus an O(n) shift of the array: about 0.1 ms at 300k scores
+                    insort(self._scores, record.score)
+                elif not self._scores_ready.is_set():
+                    self._unloaded.append(record.score)
+            # Queued under the lock, so a load in progress finds each row in _unloaded or in the table, not both
+            self._pending.put([(record.username, record.score) for record in records])
+
+    def _write_loop(self):
+        """Writer thread: drain the queue and insert everything waiting in one transaction, loading scores when asked"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        running = True
+        while running:
+            batches = [self._pending.get()]
+            while True:
+                try:
+                    batches.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            running = None not in batches
+            try:
+                # Write runs of row batches, loading scores and stopping in queue order between them
+                queued = []
+                for item in batches + [None]:
+                    if isinstance(item, list):
+                        queued.append(item)
+                        continue
+                    self._write_batches(conn, queued)
+                    queued = []
+                    if item is LOAD_SCORES:
+                        self._load_scores(conn)
+            except Exception as e:
+                # Keep the thread alive, so later Records are still saved and flush() still returns
+                print(f"[Leaderboard] Writer error: {e}")
+            finally:
+                for _ in batches:
+                    self._pending.task_done()
         conn.close()
-    
+
+    def _write_batches(self, conn: sqlite3.Connection, batches: list[list[tuple[str, int]]]):
+        """Insert queued batches in one transaction, falling back to one per batch if that fails"""
+        if not batches or not self._write_batch(conn, [row for batch in batches for row in batch]):
+            return
+        # Retry each batch alone, so a bad one does not take the others down with it
+        for batch in batches:
+            error = self._write_batch(conn, batch)
+            if error:
+                print(f"[Leaderboard] Failed to save {len(batch)} record(s): {error}")
+
+    def _load_scores(self, conn: sqlite3.Connection):
+        """Writer thread: read every score from the score index, then publish them for rank_of"""
+        try:
+            scores = array('q', (row[0] for row in conn.execute('SELECT score FROM records ORDER BY score ASC')))
+        except Exception as e:
+            print(f"[Leaderboard] Failed to load scores: {e}")
+            scores = None
+        with self._scores_lock:
+            if scores is not None:
+                for score in self._unloaded:
+                    insort(scores, score)
+            self._scores = scores
+            self._unloaded = []
+            self._scores_ready.set()
+
+    def _write_batch(self, conn: sqlite3.Connection, rows: list[tuple[str, int]]) -> Optional[Exception]:
+        """Insert `rows` in one transaction, rolling back and returning the error if that fails"""
+        try:
+            conn.execute('BEGIN')
+            conn.executemany('INSERT INTO records (username, score) VALUES (?, ?)', rows)
+            conn.execute('COMMIT')
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            return e
+        return None
+
+    def import_rows(self, rows: Iterable[tuple[str, int, str]], chunk_size: int = 50000) -> int:
+        """Insert `(username, score, timestamp)` rows, skipping ones already stored.
+
+        A row is skipped if a Record with the same username, score and timestamp was stored before
+        the import began, so importing a file twice adds nothing while repeats within it are kept.
+        Rows are consumed lazily and committed `chunk_size` at a time, so memory stays bounded for
+        any input size. The cached standings are reloaded afterwards.
+        Returns the number of rows actually inserted.
+        """
+        self.flush()
+        rows = iter(rows)
+        inserted = 0
+        last_id = self._conn.execute('SELECT COALESCE(MAX(id), 0) FROM records').fetchone()[0]
+        # Index pages are updated in random order, so a larger page cache saves most of the re-reads
+        cache_size = self._conn.execute('PRAGMA cache_size').fetchone()[0]
+        self._conn.execute(f'PRAGMA cache_size = {IMPORT_CACHE_SIZE}')
+        try:
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                before = self._conn.total_changes
+                self._conn.execute('BEGIN')
+                try:
+                    self._conn.executemany('''
+                        INSERT INTO records (username, score, timestamp)
+                        SELECT ?1, ?2, ?3
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM records
+                            WHERE username = ?1 AND score = ?2 AND timestamp IS ?3 AND id <= ?4
+                        )
+                    ''', ((username, score, timestamp, last_id) for username, score, timestamp in chunk))
+                except BaseException:
+                    self._conn.execute('ROLLBACK')
+                    raise
+                self._conn.execute('COMMIT')
+                inserted += self._conn.total_changes - before
+        finally:
+            self._conn.execute(f'PRAGMA cache_size = {cache_size}')
+            # Chunks committed before an error are kept, so reload even if the import failed part way
+            if inserted:
+                self._top = self._read_page(self.cache_size)[0]
+                self._reload_scores()
+        return inserted
+
+    def export_rows(self, since: Optional[str] = None, until: Optional[str] = None,
+                    chunk_size: int = 50000) -> Iterator[tuple[str, int, str]]:
+        """Yield `(username, score, timestamp)` rows in the order they were added.
+
+        `since` and `until` bound the timestamp (inclusive and exclusive, as 'YYYY-MM-DD HH:MM:SS'
+        or a prefix of it). Rows are fetched `chunk_size` at a time.
+        """
+        self.flush()
+        cursor = self._conn.execute('''
+            SELECT username, score, timestamp
+            FROM records
+            WHERE (? IS NULL OR timestamp >= ?) AND (? IS NULL OR timestamp < ?)
+            ORDER BY id ASC
+        ''', (since, since, until, until))
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                break
+            yield from chunk
+
+    def _cache_insert(self, record: Record):
+        """Insert a new record into the cached top records if it ranks high enough"""
+        # Equal scores keep insertion order, so the new record goes after existing ones
+        pos = bisect_right([-r.score for r in self._top], -record.score)
+        if pos < self.cache_size:
+            self._top.insert(pos, Record(record.username, record.score))
+            del self._top[self.cache_size:]
+
+    def refresh(self):
+        """Reload the cached top records from the database"""
+        self._top = self._query_top(self.cache_size)
+
     def get_top_records(self, limit: int = 10) -> list[Record]:
+        """Get Top Records, from the cache when `limit` fits in it"""
+        if limit > self.cache_size:
+            return self._query_top(limit)
+        return self._top[:limit]
+
+    def _query_top(self, limit: int) -> list[Record]:
         """Get Top Records from Database"""
-        conn = sqlite3.connect(self.db_path)
-        navigate = conn.cursor()
-        navigate.execute('''
+        return self.get_records_page(limit)[0]
+
+    def get_records_page(self, limit: int = 10, after: Optional[tuple[int, int]] = None) -> tuple[list[Record], Optional[tuple[int, int]]]:
+        """Get one page of Records in leaderboard order.
+
+        `after` is the cursor returned with the previous page (None for the first page). Pages seek
+        the score index from the cursor, so deep pages cost the same as the first one.
+        Returns the page and the cursor for the next page, which is None once the end is reached.
+        """
+        self.flush()
+        return self._read_page(limit, after)
+
+    def _read_page(self, limit: int, after: Optional[tuple[int, int]] = None) -> tuple[list[Record], Optional[tuple[int, int]]]:
+        """Query one page of Records without waiting for queued writes"""
+        if after is None:
+            rows = self._conn.execute('''
+                SELECT username, score, id
+                FROM records
+                ORDER BY score DESC, id ASC
+                LIMIT ?
+            ''', (limit,)).fetchall()
+        else:
+            score, row_id = after
+            rows = self._conn.execute('''
+                SELECT username, score, id
+                FROM records
+                WHERE score <= ? AND (score < ? OR id > ?)
+                ORDER BY score DESC, id ASC
+                LIMIT ?
+            ''', (score, score, row_id, limit)).fetchall()
+        cursor = (rows[-1][1], rows[-1][2]) if len(rows) == limit else None
+        return [Record(username, score) for username, score, _ in rows], cursor
+
+    def _reload_scores(self):
+        """Have the writer thread load the sorted scores again, e.g. after rows were added directly"""
+        with self._scores_lock:
+            self._scores = None
+            self._unloaded = []
+            self._scores_ready.clear()
+            self._pending.put(LOAD_SCORES)
+
+    def rank_of(self, score: int) -> int:
+        """Get the rank `score` holds among all Records, where equal scores share a rank.
+
+        Ranks come from bisecting a sorted in-memory copy of every score, kept in sync by add_record,
+        so no query counts rows. The writer thread loads the copy at startup, so this only waits if
+        called before that has finished.
+        """
+        self._scores_ready.wait()
+        with self._scores_lock:
+            if self._scores is not None:
+                return len(self._scores) - bisect_right(self._scores, score) + 1
+        # The copy could not be loaded, so count from the score index instead
+        self.flush()
+        return self._conn.execute('SELECT COUNT(*) FROM records WHERE score > ?', (score,)).fetchone()[0] + 1
+
+    def request_rank(self, score: int) -> Future:
+        """Get rank_of(score) as an already completed Future, matching RemoteLeaderboard's background fetch"""
+        future = Future()
+        future.set_result(self.rank_of(score))
+        return future
+
+    def get_neighbors(self, score: int, k: int = 2) -> tuple[list[Record], list[Record]]:
+        """Get the `k` Records ranked just above `score` and the `k` ranked at or just below it.
+
+        Both lists are in leaderboard order. Each is a seek into the score index followed by `k` rows.
+        """
+        self.flush()
+        above = self._conn.execute('''
             SELECT username, score
             FROM records
-            ORDER BY score DESC
+            WHERE score > ?
+            ORDER BY score ASC, id DESC
             LIMIT ?
-        ''', (limit,))
-        results = navigate.fetchall()
-        conn.close()
-        return [Record(username, score) for username, score in results]
\ No newline at end of file
+        ''', (score, k)).fetchall()
+        below = self._conn.execute('''
+            SELECT username, score
+            FROM records
+            WHERE score <= ?
+            ORDER BY score DESC, id ASC
+            LIMIT ?
+        ''', (score, k)).fetchall()
+        return [Record(*row) for row in reversed(above)], [Record(*row) for row in below]
@@ -0,0 +1,143 @@
+"""Leaderboard Import/Export
+
+Streams Records between a leaderboard database and CSV, JSON Lines or another leaderboard database,
+for merging boards from several machines and archiving old seasons. Rows are read and written
+lazily and committed in chunks, so memory use does not grow with the file size. Importing is
+idempotent: rows already present, matched on (username, score, timestamp), are skipped.
+
+    python -m models.leaderboard_io export leaderboard.db season1.csv --until 2025-01-01
+    python -m models.leaderboard_io import leaderboard.db station2.db station3.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+from typing import Iterable, Iterator, Optional
+
+from .leaderboard import Leaderboard
+
+FIELDS = ("username", "score", "timestamp")
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".db": "db", ".sqlite": "db"}
+CHUNK_SIZE = 50000
+
+
+def detect_format(path: str) -> str:
+    """Return "csv", "jsonl" or "db" from the file extension"""
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"can't tell the format of {path!r}; use one of {', '.join(FORMATS)}")
+    return fmt
+
+
+def _row(path: str, line: int, username, score, timestamp) -> tuple[str, int, str]:
+    """Validate one imported row"""
+    if username is None or score in (None, "") or not timestamp:
+        raise ValueError(f"{path}:{line}: a record needs a username, score and timestamp")
+    try:
+        return str(username), int(score), str(timestamp)
+    except ValueError:
+        raise ValueError(f"{path}:{line}: score {score!r} is not an integer") from None
+
+
+def read_rows(path: str, fmt: Optional[str] = None) -> Iterator[tuple[str, int, str]]:
+    """Yield `(username, score, timestamp)` rows from a CSV, JSON Lines or leaderboard database file"""
+    fmt = fmt or detect_format(path)
+    if fmt == "csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            missing = set(FIELDS) - set(reader.fieldnames or ())
+            if missing:
+                raise ValueError(f"{path}: missing column(s) {', '.join(sorted(missing))}")
+            for row in reader:
+                yield _row(path, reader.line_num, row["username"], row["score"], row["timestamp"])
+    elif fmt == "jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line, text in enumerate(f, 1):
+                if text.strip():
+                    record = json.loads(text)
+                    yield _row(path, line, record.get("username"), record.get("score"), record.get("timestamp"))
+    elif fmt == "db":
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            yield from conn.execute("SELECT username, score, timestamp FROM records ORDER BY id")
+        finally:
+            conn.close()
+    else:
+        raise ValueError(f"unknown format {fmt!r}")
+
+
+def write_rows(path: str, rows: Iterable[tuple[str, int, str]], fmt: Optional[str] = None) -> int:
+    """Write `(username, score, timestamp)` rows to a CSV, JSON Lines or leaderboard database file.
+
+    Returns the number of rows written; exporting to an existing database skips rows it already has.
+    """
+    fmt = fmt or detect_format(path)
+    count = 0
+    if fmt == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+    elif fmt == "jsonl":
+        with open(path, "w", encoding="utf-8") as f:
+            for username, score, timestamp in rows:
+                f.write(json.dumps({"username": username, "score": score, "timestamp": timestamp}) + "\n")
+                count += 1
+    elif fmt == "db":
+        target = Leaderboard(path)
+        try:
+            count = target.import_rows(rows, CHUNK_SIZE)
+        finally:
+            target.close()
+    else:
+        raise ValueError(f"unknown format {fmt!r}")
+    return count
+
+
+def import_file(leaderboard: Leaderboard, path: str, fmt: Optional[str] = None) -> int:
+    """Import every Record in `path` into `leaderboard`, returning how many were new"""
+    return leaderboard.import_rows(read_rows(path, fmt), CHUNK_SIZE)
+
+
+def export_file(leaderboard: Leaderboard, path: str, fmt: Optional[str] = None,
+                since: Optional[str] = None, until: Optional[str] = None) -> int:
+    """Export the Records of `leaderboard` timestamped in `[since, until)` to `path`"""
+    return write_rows(path, leaderboard.export_rows(since, until, CHUNK_SIZE), fmt)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import and export leaderboard records.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="merge records from CSV, JSON Lines or leaderboard databases")
+    imp.add_argument("db", help="leaderboard database to import into")
+    imp.add_argument("sources", nargs="+")
+    imp.add_argument("--format", choices=sorted(set(FORMATS.values())), help="default: from each file's extension")
+    exp = sub.add_parser("export", help="write records to CSV, JSON Lines or another leaderboard database")
+    exp.add_argument("db", help="leaderboard database to export from")
+    exp.add_argument("output")
+    exp.add_argument("--format", choices=sorted(set(FORMATS.values())), help="default: from the output's extension")
+    exp.add_argument("--since", help="only records at or after this timestamp, e.g. 2025-01-01")
+    exp.add_argument("--until", help="only records before this timestamp")
+    args = parser.parse_args(argv)
+
+    leaderboard = Leaderboard(args.db)
+    try:
+        if args.command == "import":
+            for source in args.sources:
+                added = import_file(leaderboard, source, args.format)
+                print(f"[Leaderboard] Imported {added} new record(s) from {source}")
+        else:
+            written = export_file(leaderboard, args.output, args.format, args.since, args.until)
+            print(f"[Leaderboard] Exported {written} record(s) to {args.output}")
+    finally:
+        leaderboard.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""Leaderboard Service
+
+Optional shared leaderboard for running many stations against one board. `LeaderboardServer` is an
+asyncio TCP server that stores Records in SQLite through a local `Leaderboard`, and `RemoteLeaderboard`
+is a drop-in client backend with the same interface the game uses.
+
+The protocol is one JSON object per line in each direction. Requests carry an "op" field
+("submit", "top", "rank" or "neighbors") and every reply has "ok", plus "error" on failure.
+
+Run a server, point the game at it, or load-test it on localhost:
+
+    python -m models.leaderboard_service serve --db leaderboard.db --port 8765
+    LEADERBOARD_SERVER=127.0.0.1:8765 python main.py
+    python -m models.leaderboard_service loadtest --clients 2000 --submissions 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+from .leaderboard import MAX_SCORE, MIN_SCORE, Leaderboard
+from .record import Record
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_LINE = 1 << 20  # longest request or reply line accepted, in bytes
+
+
+class LeaderboardServiceError(Exception):
+    """Raised when the leaderboard server rejects a request"""
+
+
+def _score(value) -> int:
+    """Read a score from a request, rejecting ones SQLite cannot store"""
+    score = int(value)
+    if not MIN_SCORE <= score <= MAX_SCORE:
+        raise LeaderboardServiceError(f"score out of range: {score}")
+    return score
+
+
+class LeaderboardServer:
+    def __init__(self, db_path: str = "leaderboard.db", host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 cache_size: int = 100, remembered_batches: int = 10000):
+        """Serve the leaderboard stored at `db_path`.
+
+        Args:
+            port: TCP port to listen on; 0 picks a free one, available as `port` after `start()`.
+            cache_size: top records kept in memory, the largest "top" request answered without a query.
+            remembered_batches: recent submission ids kept so a retried batch is only stored once.
+        """
+        self.db_path = db_path
+        self.host = host
+        self.port = port
+        self.cache_size = cache_size
+        self.leaderboard: Optional[Leaderboard] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._handlers: set[asyncio.Task] = set()
+        # Reads that query the Database or wait on the writer thread run here, off the event loop.
+        # One thread, so the Leaderboard's connection is only ever used by the thread that opened it.
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._batches: OrderedDict[str, None] = OrderedDict()
+        self._remembered_batches = remembered_batches
+
+    async def start(self):
+        """Open the Database and start accepting connections"""
+        # Submissions only queue rows; the Leaderboard's writer thread batches them into transactions.
+        # The top records are loaded when it is created, so cached "top" requests run on the event loop.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leaderboard-server")
+        self.leaderboard = await self._call(Leaderboard, self.db_path, cache_size=self.cache_size)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_LINE, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"[LeaderboardServer] Listening on {self.host}:{self.port}")
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def stop(self):
+        """Stop accepting connections, disconnect clients and write any queued Records"""
+        self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        # Let every connection handler finish, so none is left to be cancelled when the loop closes
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        await self._call(self.leaderboard.close)
+        self._executor.shutdown()
+
+    async def _call(self, func, *args, **kwargs):
+        """Run `func` on the Leaderboard thread and wait for its result"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, lambda: func(*args, **kwargs))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer requests from one client connection until it disconnects"""
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        self._clients.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    reply = await self._dispatch(json.loads(line))
+                except (ValueError, KeyError, TypeError, LeaderboardServiceError) as e:
+                    reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError, asyncio.CancelledError):
+            pass  # disconnected, sent a line longer than MAX_LINE, or the server is shutting down
+        finally:
+            self._clients.discard(writer)
+            self._handlers.discard(task)
+            writer.close()
+
+    async def _dispatch(self, message: dict) -> dict:
+        """Run one request against the local Leaderboard"""
+        op = message["op"]
+        if op == "submit":
+            batch = message.get("batch")
+            if batch is not None and batch in self._batches:
+                return {"ok": True, "count": 0}  # a retry of a batch that was already stored
+            records = [Record(str(username), _score(score)) for username, score in message["records"]]
+            self.leaderboard.add_records(records)
+            if batch is not None:
+                self._batches[batch] = None
+                if len(self._batches) > self._remembered_batches:
+                    self._batches.popitem(last=False)
+            return {"ok": True, "count": len(records)}
+        if op == "top":
+            limit = int(message.get("limit", 10))
+            if limit > self.cache_size:
+                records = await self._call(self.leaderboard.get_top_records, limit)
+            else:
+                records = self.leaderboard.get_top_records(limit)
+            return {"ok": True, "records": [[r.username, r.score] for r in records]}
+        if op == "rank":
+            return {"ok": True, "rank": await self._call(self.leaderboard.rank_of, _score(message["score"]))}
+        if op == "neighbors":
+            above, below = await self._call(self.leaderboard.get_neighbors, _score(message["score"]), int(message.get("k", 2)))
+            return {"ok": True, "above": [[r.username, r.score] for r in above],
+                    "below": [[r.username, r.score] for r in below]}
+        raise LeaderboardServiceError(f"unknown op {op!r}")
+
+
+class ConnectionPool:
+    def __init__(self, host: str, port: int, size: int = 4, timeout: float = 2.0):
+        """Keep up to `size` open connections to the server and reuse them across requests"""
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(size)
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def request(self, message: dict) -> dict:
+        """Send one request and return its reply; the connection is dropped on any failure"""
+        async with self._slots:
+            if self._idle:
+                reader, writer = self._idle.pop()
+            else:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port, limit=MAX_LINE), self.timeout)
+            try:
+                writer.write(json.dumps(message).encode() + b"\n")
+                await writer.drain()
+                line = await asyncio.wait_for(reader.readline(), self.timeout)
+                if not line:
+                    raise ConnectionError("server closed the connection")
+            except BaseException:
+                writer.close()
+                raise
+            self._idle.append((reader, writer))
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise LeaderboardServiceError(reply.get("error", "request failed"))
+        return reply
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+class RemoteLeaderboard:
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, cache_size: int = 10, cache_ttl: float = 2.0,
+                 pool_size: int = 4, batch_size: int = 100, batch_delay: float = 0.05,
+                 retries: int = 4, retry_delay: float = 0.1, timeout: float = 2.0,
+                 on_refresh: Optional[Callable[[], None]] = None):
+        """Leaderboard backend that talks to a `LeaderboardServer`.
+
+        Submissions are collected for `batch_delay` seconds and sent in batches of up to `batch_size`,
+        retried with exponential backoff. The top records are served from a local cache that is
+        loaded in the background on first use and refreshed once it is older than `cache_ttl` seconds,
+        so reading them never waits on the network. `on_refresh` is called from the client thread
+        after each background refresh. Ranks are fetched in the background with `request_rank`.
+        """
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.on_refresh = on_refresh
+        self._top: list[Record] = None
+        self._top_time = 0.0
+        self._refreshing = None  # concurrent.futures.Future of an in-flight background refresh
+        self._outbox: list[list] = []  # rows waiting to be sent, only touched on the event loop
+        self._sender: Optional[asyncio.Task] = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="leaderboard-client", daemon=True)
+        self._thread.start()
+        self._pool = ConnectionPool(host, port, pool_size, timeout)
+
+    @classmethod
+    def from_address(cls, address: str, **kwargs) -> "RemoteLeaderboard":
+        """Create a client for a "host:port" address"""
+        host, _, port = address.rpartition(":")
+        return cls(host or DEFAULT_HOST, int(port), **kwargs)
+
+    def _run(self, coro, timeout: Optional[float] = None):
+        """Run `coro` on the client's event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    async def _request(self, message: dict) -> dict:
+        """Send a request, retrying connection failures with exponential backoff"""
+        for attempt in range(self.retries + 1):
+            try:
+                return await self._pool.request(message)
+            except (OSError, asyncio.TimeoutError, ValueError):
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(self.retry_delay * 2 ** attempt)
+
+    def close(self):
+        """Send any queued Records, then close the connections and stop the client thread"""
+        if self._loop.is_closed():
+            return
+        self.flush()
+        self._run(self._pool.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def flush(self):
+        """Block until every queued Record has been sent, or given up on"""
+        self._run(self._drain())
+
+    async def _drain(self):
+        while self._sender is not None:
+            await asyncio.shield(self._sender)
+
+    def add_record(self, record: Record):
+        """Queue Record for submission and add it to the cached standings immediately"""
+        self.add_records([record])
+
+    def add_records(self, records: Iterable[Record]):
+        """Queue many Records for submission"""
+        records = list(records)
+        for record in records:
+            self._cache_insert(record)
+        self._loop.call_soon_threadsafe(self._enqueue, [[record.username, record.score] for record in records])
+
+    def _enqueue(self, rows: list[list]):
+        self._outbox.extend(rows)
+        if self._sender is None:
+            self._sender = self._loop.create_task(self._send_pending())
+
+    async def _send_pending(self):
+        """Send the outbox in batches once submissions arriving together have been collected"""
+        try:
+            await asyncio.sleep(self.batch_delay)
+            while self._outbox:
+                rows, self._outbox = self._outbox[:self.batch_size], self._outbox[self.batch_size:]
+                # The batch id lets the server discard a resend of a batch whose reply was lost
+                message = {"op": "submit", "batch": uuid.uuid4().hex, "records": rows}
+                try:
+                    await self._request(message)
+                except (OSError, asyncio.TimeoutError, ValueError, LeaderboardServiceError) as e:
+                    print(f"[Leaderboard] Failed to submit {len(rows)} record(s): {e}")
+        finally:
+            self._sender = None
+
+    def _cache_insert(self, record: Record):
+        """Insert a new record into the cached top records if it ranks high enough"""
+        if self._top is None:
+            return
+        pos = bisect_right([-r.score for r in self._top], -record.score)
+        if pos < self.cache_size:
+            self._top = self._top[:pos] + [Record(record.username, record.score)] + self._top[pos:self.cache_size - 1]
+
+    async def _fetch_top(self, limit: int) -> list[Record]:
+        await self._drain()
+        reply = await self._request({"op": "top", "limit": limit})
+        return [Record(username, score) for username, score in reply["records"]]
+
+    async def _refresh_top(self):
+        try:
+            self._top = await self._fetch_top(self.cache_size)
+        except (OSError, asyncio.TimeoutError, ValueError, LeaderboardServiceError) as e:
+            print(f"[Leaderboard] Failed to load standings: {e}")
+            if self._top is None:
+                self._top = []
+        self._top_time = time.monotonic()  # after a failure too, wait a full TTL before trying again
+        if self.on_refresh is not None:
+            self.on_refresh()
+
+    def refresh(self):
+        """Reload the cached top records from the server, waiting for the reply"""
+        self._run(self._refresh_top())
+
+    def get_top_records(self, limit: int = 10) -> list[Record]:
+        """Get Top Records from the cache, loading or refreshing it in the background when missing or expired.
+
+        Returns no records until the first load arrives.
+        """
+        if limit > self.cache_size:
+            try:
+                return self._run(self._fetch_top(limit))
+            except (OSError, asyncio.TimeoutError, ValueError, LeaderboardServiceError):
+                return []
+        expired = self._top is None or time.monotonic() - self._top_time > self.cache_ttl
+        if expired and (self._refreshing is None or self._refreshing.done()):
+            self._top_time = time.monotonic()
+            self._refreshing = asyncio.run_coroutine_threadsafe(self._refresh_top(), self._loop)
+        return (self._top or [])[:limit]
+
+    def request_rank(self, score: int) -> Future:
+        """Start fetching the rank `score` holds on the server and return a Future of it.
+
+        The request is sent once, without waiting for queued submissions or retrying, so the Future
+        settles as soon as that request answers or times out; it holds None if it fails.
+        """
+        return asyncio.run_coroutine_threadsafe(self._rank(score), self._loop)
+
+    async def _rank(self, score: int) -> Optional[int]:
+        try:
+            return (await self._pool.request({"op": "rank", "score": score}))["rank"]
+        except (OSError, asyncio.TimeoutError, ValueError, LeaderboardServiceError) as e:
+            print(f"[Leaderboard] Failed to get rank: {e}")
+            return None
+
+    def rank_of(self, score: int) -> Optional[int]:
+        """Get the rank `score` holds on the server, or None if it can't be reached"""
+        return self.request_rank(score).result()
+
+    def get_neighbors(self, score: int, k: int = 2) -> tuple[list[Record], list[Record]]:
+        """Get the `k` Records ranked just above `score` and the `k` ranked at or just below it"""
+        try:
+            reply = self._run(self._request({"op": "neighbors", "score": score, "k": k}))
+        except (OSError, asyncio.TimeoutError, ValueError, LeaderboardServiceError):
+            return [], []
+        return [Record(*row) for row in reply["above"]], [Record(*row) for row in reply["below"]]
+
+
+async def load_test(host: str, port: int, clients: int, submissions: int, batch: int) -> dict:
+    """Submit from `clients` concurrent connections and report throughput and latency"""
+    latencies: list[float] = []
+    failures = 0
+
+    async def station(n: int):
+        nonlocal failures
+        pool = ConnectionPool(host, port, size=1, timeout=30.0)
+        try:
+            for i in range(submissions):
+                rows = [[f"station{n}", (n * 7919 + i * 104729 + j) % 100000] for j in range(batch)]
+                start = time.perf_counter()
+                try:
+                    await pool.request({"op": "submit", "batch": uuid.uuid4().hex, "records": rows})
+                    latencies.append(time.perf_counter() - start)
+                except (OSError, asyncio.TimeoutError, ValueError, LeaderboardServiceError):
+                    failures += 1
+        finally:
+            await pool.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(station(n) for n in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "failures": failures,
+        "records": len(latencies) * batch,
+        "seconds": round(elapsed, 3),
+        "records_per_second": round(len(latencies) * batch / elapsed),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2) if latencies else None,
+    }
+
+
+async def _serve(args):
+    server = LeaderboardServer(args.db, args.host, args.port)
+    await server.start()
+    try:
+        await server.serve_forever()
+    finally:
+        await server.stop()
+
+
+async def _load_test(args):
+    server = None
+    port = args.port
+    if port is None:
+        # No server given: run one on localhost against a throwaway database
+        db_path = os.path.join(tempfile.mkdtemp(), "loadtest.db")
+        server = LeaderboardServer(db_path, args.host, 0)
+        await server.start()
+        port = server.port
+    try:
+        result = await load_test(args.host, port, args.clients, args.submissions, args.batch)
+    finally:
+        if server is not None:
+            await server.stop()
+    print(json.dumps(result, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared leaderboard server and load test.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run a leaderboard server")
+    serve.add_argument("--db", default="leaderboard.db")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    test = sub.add_parser("loadtest", help="submit from many concurrent clients")
+    test.add_argument("--host", default=DEFAULT_HOST)
+    test.add_argument("--port", type=int, default=None, help="server to test; starts a local one if omitted")
+    test.add_argument("--clients", type=int, default=1000)
+    test.add_argument("--submissions", type=int, default=5, help="requests per client")
+    test.add_argument("--batch", type=int, default=1, help="records per request")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args) if args.command == "serve" else _load_test(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
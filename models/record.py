@@ -1,5 +1,7 @@
 """Record Class"""
 class Record():
+    __slots__ = ("username", "score")
+
     def __init__(self, username: str, score: int):
         self.username = username
-        self.score = score
\ No newline at end of file
+        self.score = score
@@ -0,0 +1,120 @@
+"""Score Index Class
+
+Global index of every word across all levels, ordered by score, so difficulty can be queried
+as a continuous score range instead of a whole sub-dictionary. Range queries bisect a compact
+`array('H')` of sorted scores in O(log n).
+
+Sub-dictionaries are written in ascending score order, so concatenating the levels is normally
+already sorted and the index is just the concatenated score column. Otherwise a permutation is
+sorted once when the index is built.
+"""
+
+from __future__ import annotations
+
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+
+from .word_store import WordColumn
+
+
+class ScoreIndex:
+    def __init__(self, levels: Sequence[WordColumn], level_loader: Callable[[int], WordColumn]):
+        """Build the index from the score columns of `levels`.
+
+        Args:
+            levels: every level in order; only their scores are kept.
+            level_loader: returns the 0-based level when a word has to be decoded.
+        """
+        self._load_level = level_loader
+        self._starts = array("I")  # first global position of each level
+        self.level_min_scores: List[Optional[int]] = []
+        scores = array("H")
+        for level in levels:
+            self._starts.append(len(scores))
+            level_scores = level.scores()
+            scores.extend(level_scores)
+            self.level_min_scores.append(min(level_scores) if len(level_scores) else None)
+        self._order: Optional[array] = None  # sorted position -> global position, None when already sorted
+        if any(scores[i] > scores[i + 1] for i in range(len(scores) - 1)):
+            self._order = array("I", sorted(range(len(scores)), key=scores.__getitem__))
+            scores = array("H", (scores[i] for i in self._order))
+        self._scores = scores
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    @property
+    def min_score(self) -> int:
+        return self._scores[0] if self._scores else 0
+
+    @property
+    def max_score(self) -> int:
+        return self._scores[-1] if self._scores else 0
+
+    def range(self, lo: int, hi: int) -> Tuple[int, int]:
+        """Return the `[start, stop)` sorted positions of words with `lo <= score <= hi`."""
+        return bisect_left(self._scores, lo), bisect_right(self._scores, hi)
+
+    def entry(self, pos: int) -> Tuple[str, int, int]:
+        """Return `(word, score, dict_num)` for sorted position `pos`."""
+        g = pos if self._order is None else self._order[pos]
+        idx = bisect_right(self._starts, g) - 1
+        word, score = self._load_level(idx)[g - self._starts[idx]]
+        return word, score, idx + 1
+
+    def sample(self, rand: random.Random, lo: int, hi: int, count: int) -> List[Tuple[str, int, int]]:
+        """Return `count` distinct random entries with `lo <= score <= hi`.
+
+        If the range holds fewer than `count` words it is widened to the nearest scores on either side.
+        """
+        return [self.entry(pos) for pos in self.sample_positions(rand, lo, hi, min(count, len(self._scores)))]
+
+    def sample_bands(self, rand: random.Random, bands: Sequence[Tuple[int, int]],
+                     exclude: Set[int]) -> List[Tuple[str, int, int]]:
+        """Return one entry per `(lo, hi)` score band, never a position in `exclude` or drawn for an earlier band.
+
+        The chosen positions are added to `exclude`, so passing the same set across calls keeps words
+        from repeating. A band whose words are all excluded is widened like in `sample`.
+        """
+        entries = []
+        for lo, hi in bands:
+            pos = self.sample_positions(rand, lo, hi, 1, exclude)[0]
+            exclude.add(pos)
+            entries.append(self.entry(pos))
+        return entries
+
+    def sample_positions(self, rand: random.Random, lo: int, hi: int, count: int,
+                         exclude: Optional[Set[int]] = None) -> List[int]:
+        """Return `count` distinct random sorted positions with `lo <= score <= hi`, skipping those in `exclude`.
+
+        If the range holds fewer than `count` such positions it is widened to the nearest scores on either side.
+        Raises ValueError if the whole index holds fewer than `count` positions outside `exclude`.
+        """
+        exclude = exclude or set()
+        if len(self._scores) - len(exclude) < count:
+            raise ValueError("not enough words left to sample from")
+        start, stop = self.range(lo, hi)
+        free = stop - start - sum(1 for pos in exclude if start <= pos < stop)
+        while free < count:
+            # Widen towards whichever neighbouring score is closer to the requested range
+            below = lo - self._scores[start - 1] if start > 0 else None
+            above = self._scores[stop] - hi if stop < len(self._scores) else None
+            if above is None or (below is not None and below <= above):
+                start -= 1
+                free += start not in exclude
+            else:
+                free += stop not in exclude
+                stop += 1
+
+        if free * 2 <= stop - start or free <= 2 * count:
+            # Mostly excluded or nearly exhausted: pick from the free positions directly
+            return rand.sample([pos for pos in range(start, stop) if pos not in exclude], count)
+        # Mostly free: rejection sampling needs at most two tries per position on average
+        chosen: List[int] = []
+        while len(chosen) < count:
+            pos = rand.randrange(start, stop)
+            if pos not in exclude and pos not in chosen:
+                chosen.append(pos)
+        return chosen
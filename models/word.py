@@ -1,5 +1,8 @@
 """Word Class"""
 class Word():
-    def __init__(self, score: int, word: str):
+    __slots__ = ("score", "word", "source_dict")
+
+    def __init__(self, score: int, word: str, source_dict: int = None):
         self.score = score
-        self.word = word
\ No newline at end of file
+        self.word = word
+        self.source_dict = source_dict
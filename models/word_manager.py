@@ -1,22 +1,31 @@
 """Word Manager Class
 
 Responsibilities:
-- Load 20 sub-dictionary files `subdict_01.txt`..`subdict_20.txt` from the `dictionaries` folder.
-- Provide random selection from a single dictionary.
+- Load the 20 sub-dictionaries from the compiled `subdicts.pack` in the `dictionaries` folder, or from
+  `subdict_01.txt`..`subdict_20.txt` when no pack exists.
+- Optionally keep only a window of levels resident, prefetching the next level on a background thread.
+- Provide random selection from a single dictionary, without repeating a word until that dictionary is exhausted.
 - Provide three-word selection for the three clouds (consecutive dictionaries: level, level+1, level+2).
 - Track how many times each dictionary is pulled from and how many correct guesses came from each dictionary.
-- Progress difficulty (increase base level) after a configurable number of correct guesses (default = 5).
+- Progress difficulty (increase base level) after a configurable number of correct guesses (default = 5),
+  or, in score progression, raise a target score smoothly and query words by score range across all levels.
 
 This module intentionally keeps behavior simple and in-memory (no persistence).
 """
 
 from __future__ import annotations
 
+import math
 import os
 import random
-from typing import List, Tuple, Dict, Optional
+import threading
+from typing import Iterator, List, Tuple, Dict, Optional, Set
 from utils import resource_path
+from .dictionary_pack import DictionaryPack, PACK_FILENAME
+from .score_index import ScoreIndex
 from .word import Word
+from .word_sampler import ScoreWeightedSampler, ShuffledSampler
+from .word_store import WordColumn
 
 
 class WordManager:
@@ -24,7 +33,12 @@ class WordManager:
                  dict_dir: str = "dictionaries",
                  start_level: int = 1,
                  difficulty_threshold: int = 5,
-                 seed: Optional[int] = None):
+                 seed: Optional[int] = None,
+                 windowed: bool = False,
+                 prefetch_margin: int = 1,
+                 progression: str = "level",
+                 score_step: int = 20,
+                 score_band: int = 40):
         """Initialize the WordManager.
 
         Args:
@@ -32,7 +46,18 @@ class WordManager:
             start_level: starting base difficulty level (1..18).
             difficulty_threshold: number of correct guesses across the current triple required to increase level.
             seed: optional random seed for deterministic selection (useful for testing).
+            windowed: only keep the cloud levels (`current_level`..`current_level+2`) and the next level resident,
+                loading others on demand and evicting levels that fall behind the window.
+            prefetch_margin: in windowed mode, start loading level `current_level+3` in the background once
+                the correct-guess counter is within this many guesses of `difficulty_threshold`.
+            progression: "level" to move the clouds up one sub-dictionary every `difficulty_threshold` correct
+                guesses, or "score" to raise a target score by `score_step` on every correct guess.
+            score_step: score added to the target score per correct guess in score progression.
+            score_band: width of each cloud's score range in score progression; the clouds use the bands
+                starting at the target score, target + band and target + 2 * band.
         """
+        if progression not in ("level", "score"):
+            raise ValueError("progression must be 'level' or 'score'")
         self.dict_dir = dict_dir
         self.min_level = 1
         self.max_level = 18  # base level; clouds use level, level+1, level+2 up to 20
@@ -42,50 +67,157 @@ class WordManager:
         self.difficulty_threshold = max(1, int(difficulty_threshold))
 
         # Internal storage
-        self.dicts: List[List[Tuple[str, int]]] = []  # index 0 -> subdict_01.txt
+        self.dicts: List[Optional[WordColumn]] = []  # index 0 -> subdict_01.txt, None if not resident
+        self._pack: Optional[DictionaryPack] = None
+
+        # Windowed loading
+        self.windowed = windowed
+        self.prefetch_margin = max(0, int(prefetch_margin))
+        self._load_lock = threading.Lock()
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._prefetch_idx: Optional[int] = None
 
         # Simplified progression: count total correct guesses in-session.
         self._global_corrects: int = 0
 
-        # Randomness
+        # Score progression: global index over every level, built on first use
+        self.progression = progression
+        self.score_step = max(1, int(score_step))
+        self.score_band = max(1, int(score_band))
+        self._start_level = self.current_level
+        self.current_score: Optional[int] = None
+        self._score_index: Optional[ScoreIndex] = None
+        self._drawn_positions: Set[int] = set()  # score index positions already drawn this session
+
+        # Randomness: one lazily shuffled sampler per level, created on first draw
         self._rand = random.Random(seed)
+        self._samplers: List[Optional[ShuffledSampler]] = []
+
+        # Optional score bias: (target, spread), with score-weighted samplers built per level on first use
+        self._score_bias: Optional[Tuple[float, float]] = None
+        self._weighted: List[Optional[ScoreWeightedSampler]] = []
+        self._weighted_bias: List[Optional[Tuple[float, float]]] = []
 
         # Load dictionaries
         self.load_dictionaries(self.dict_dir)
 
     # ------------------ Loading ------------------
     def load_dictionaries(self, dict_dir: Optional[str] = None) -> None:
-        """Load the 20 subdict files into memory.
+        """Load the 20 sub-dictionaries.
 
-        Files are expected to be named `subdict_01.txt`..`subdict_20.txt` and contain lines `word|score`.
+        The compiled `subdicts.pack` is memory-mapped when present, so words are only decoded when sampled.
+        Otherwise falls back to parsing `subdict_01.txt`..`subdict_20.txt`, which contain lines `word|score`.
         Missing files will be treated as empty dictionaries.
+        In windowed mode only the current cloud levels are loaded here; the rest are loaded on demand.
         """
         if dict_dir is None:
             dict_dir = self.dict_dir
-        self.dicts = []
-        for i in range(1, 21):
-            filename = resource_path(os.path.join(self.dict_dir, f"subdict_{i:02d}.txt"))
-            entries: List[Tuple[str, int]] = []
-            try:
-                with open(filename, "r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
+        self.dict_dir = dict_dir
+        self.close()
+        self._load_pack(dict_dir)
+        self.dicts = [None] * 20
+        self._samplers = [None] * 20
+        self._weighted = [None] * 20
+        self._weighted_bias = [None] * 20
+        self._score_index = None
+        self._drawn_positions = set()
+        self.current_score = None
+        if self.windowed:
+            self._update_window()
+        else:
+            for idx in range(20):
+                self._level(idx)
+
+    def _load_pack(self, dict_dir: str) -> bool:
+        """Map the compiled dictionary pack. Returns False if it is missing or unreadable."""
+        path = resource_path(os.path.join(dict_dir, PACK_FILENAME))
+        if not os.path.isfile(path):
+            return False
+        try:
+            pack = DictionaryPack(path)
+        except (OSError, ValueError) as e:
+            print(f"[WordManager] Ignoring dictionary pack {path}: {e}")
+            return False
+        self._pack = pack
+        return True
+
+    def _read_level(self, idx: int) -> WordColumn:
+        """Read the 0-based level `idx` from the pack or its text file."""
+        if self._pack is not None:
+            return self._pack.level(idx) if idx < len(self._pack) else WordColumn.from_entries([])
+        return WordColumn.from_entries(self._load_text_dictionary(self.dict_dir, idx + 1))
+
+    def _level(self, idx: int) -> WordColumn:
+        """Return the 0-based level `idx`, loading it synchronously if it is not resident."""
+        level = self.dicts[idx]
+        if level is not None:
+            return level
+        thread = self._prefetch_thread
+        if thread is not None and self._prefetch_idx == idx:
+            # Already being loaded in the background: wait for it rather than parsing it twice
+            thread.join()
+        return self._load_resident(idx)
+
+    def _load_resident(self, idx: int) -> WordColumn:
+        """Read the 0-based level `idx` into `dicts` unless it is already resident."""
+        with self._load_lock:
+            if self.dicts[idx] is None:
+                self.dicts[idx] = self._read_level(idx)
+            return self.dicts[idx]
+
+    def _prefetch(self, idx: int) -> None:
+        """Load the 0-based level `idx` on a background thread if it is not already resident."""
+        if not (0 <= idx < len(self.dicts)) or self.dicts[idx] is not None:
+            return
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+        self._prefetch_idx = idx
+        self._prefetch_thread = threading.Thread(target=self._load_resident, args=(idx,), daemon=True)
+        self._prefetch_thread.start()
+
+    def _update_window(self) -> None:
+        """Evict levels outside the window and load the cloud levels for `current_level`."""
+        first = self.current_level - 1
+        last = min(first + 3, len(self.dicts) - 1)  # three cloud levels plus the next one
+        with self._load_lock:
+            for idx in range(len(self.dicts)):
+                if idx < first or idx > last:
+                    self.dicts[idx] = None
+        for idx in range(first, min(first + 3, len(self.dicts))):
+            self._level(idx)
+
+    def _load_text_dictionary(self, dict_dir: str, dict_num: int) -> Iterator[Tuple[str, int]]:
+        """Parse `subdict_XX.txt` for a single dictionary numbered 1..20, yielding `(word, score)` pairs."""
+        filename = resource_path(os.path.join(dict_dir, f"subdict_{dict_num:02d}.txt"))
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    if "|" in line:
+                        w, s = line.split("|", 1)
+                        try:
+                            score = int(s)
+                        except Exception:
+                            # skip malformed score lines
                             continue
-                        if "|" in line:
-                            w, s = line.split("|", 1)
-                            try:
-                                score = int(s)
-                            except Exception:
-                                # skip malformed score lines
-                                continue
-                            entries.append((w, score))
-                        else:
-                            # fallback: if file contains plain words (no score), assign default score
-                            entries.append((line, 0))
-            except FileNotFoundError:
-                entries = []
-            self.dicts.append(entries)
+                        yield w, score
+                    else:
+                        # fallback: if file contains plain words (no score), assign default score
+                        yield line, 0
+        except FileNotFoundError:
+            return
+
+    def close(self) -> None:
+        """Wait for any background prefetch and release the memory-mapped dictionary pack, if one is loaded."""
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+        if self._pack is not None:
+            self.dicts = []
+            self._pack.close()
+            self._pack = None
 
     # ------------------ Selection ------------------
     def _find_nearest_nonempty_index(self, idx: int) -> Optional[int]:
@@ -94,22 +226,22 @@ class WordManager:
         Returns 0-based index or None if none available.
         """
         n = len(self.dicts)
-        if 0 <= idx < n and self.dicts[idx]:
+        if 0 <= idx < n and self._level(idx):
             return idx
         # expand outwards
         for dist in range(1, n):
             hi = idx + dist
             lo = idx - dist
-            if hi < n and self.dicts[hi]:
+            if hi < n and self._level(hi):
                 return hi
-            if lo >= 0 and self.dicts[lo]:
+            if lo >= 0 and self._level(lo):
                 return lo
         return None
 
     def get_random_from_dict(self, dict_num: int) -> Word:
         """Return a random `Word` from a single dictionary numbered 1..20.
 
-        The returned `Word` object will have an additional attribute `source_dict` (1-based index).
+        The returned `Word` object has its `source_dict` set to the 1-based index it was drawn from.
         This function updates internal `pull_counts` and `_last_pulled_map`.
         """
         if not (1 <= dict_num <= 20):
@@ -119,21 +251,71 @@ class WordManager:
         if found is None:
             raise RuntimeError("No dictionaries available to select from")
 
-        word_text, score = self._rand.choice(self.dicts[found])
-        w = Word(score, word_text)
-        # attach metadata for downstream consumers
-        try:
-            setattr(w, "source_dict", found + 1)
-        except Exception:
-            # best-effort - Word is a plain object so this should succeed
-            pass
-        return w
+        level = self._level(found)
+        if self._score_bias is not None:
+            i = self._weighted_sampler(found).draw(self._rand)
+        else:
+            sampler = self._samplers[found]
+            if sampler is None:
+                sampler = self._samplers[found] = ShuffledSampler(len(level))
+            i = sampler.draw(self._rand)
+        return Word(level.score_at(i), level.word_at(i), found + 1)
+
+    def _weighted_sampler(self, idx: int) -> ScoreWeightedSampler:
+        """Return the score-weighted sampler for level `idx`, rebuilding its alias table if the bias changed."""
+        sampler = self._weighted[idx]
+        if sampler is None:
+            sampler = self._weighted[idx] = ScoreWeightedSampler(self._level(idx).scores())
+        if self._weighted_bias[idx] != self._score_bias:
+            target, spread = self._score_bias
+            sampler.set_weight(lambda score: math.exp(-0.5 * ((score - target) / spread) ** 2))
+            self._weighted_bias[idx] = self._score_bias
+        return sampler
+
+    def set_score_bias(self, target: Optional[float], spread: float = 100.0) -> None:
+        """Bias selection within each dictionary toward words scoring near `target`.
+
+        Each word is weighted by a Gaussian of width `spread` centred on `target` (for example a score
+        derived from the player's recent performance). Pass None to restore uniform selection.
+        Per-level alias tables are rebuilt lazily, once per change, so draws stay O(1).
+        """
+        if target is None:
+            self._score_bias = None
+        else:
+            self._score_bias = (float(target), max(float(spread), 1e-6))
+
+    def score_index(self) -> ScoreIndex:
+        """Return the global score index, building it from every level's score column on first use."""
+        if self._score_index is None:
+            levels = [self.dicts[i] if self.dicts[i] is not None else self._read_level(i) for i in range(20)]
+            self._score_index = ScoreIndex(levels, self._level)
+        return self._score_index
+
+    def get_words_by_score(self, lo: int, hi: int, count: int = 3) -> List[Word]:
+        """Return `count` distinct random words with `lo <= score <= hi`, from any level.
+
+        Costs O(log n) for the range lookup plus O(count); the range is widened to the nearest
+        scores if it holds fewer than `count` words. Words already drawn this session are skipped.
+        """
+        return self._draw_score_bands([(lo, hi)] * count)
+
+    def _draw_score_bands(self, bands: List[Tuple[int, int]]) -> List[Word]:
+        """Draw one word per `(lo, hi)` score band, all distinct and none drawn earlier this session."""
+        index = self.score_index()
+        if len(index) - len(self._drawn_positions) < len(bands):
+            # Every word has been used: start a new pass, like the per-level samplers do
+            self._drawn_positions.clear()
+        return [Word(score, word, dict_num)
+                for word, score, dict_num in index.sample_bands(self._rand, bands, self._drawn_positions)]
 
     def get_three_cloud_words(self, increment_correct: bool = False) -> List[Word]:
         """Return three Word objects for the three clouds based on `current_level`.
 
         The cloud dictionaries are `current_level`, `current_level+1`, `current_level+2` (1-based).
-        Ensures attempts to avoid duplicate word texts among the three selected words.
+        Each dictionary's sampler never repeats a word until it is exhausted, so no retries are needed
+        to keep the three words distinct.
+        In score progression the three words are drawn together from the score index, excluding each
+        other and every word already drawn this session.
 
         If `increment_correct` is True, treat this call as the result of a correct guess and
         apply the global-correct increment (which may increase difficulty before selecting words).
@@ -142,26 +324,16 @@ class WordManager:
         if increment_correct:
             self._apply_correct_increment()
 
+        if self.progression == "score":
+            target = self._target_score()
+            band = self.score_band
+            return self._draw_score_bands([(target + k * band, target + (k + 1) * band - 1) for k in range(3)])
+
         words: List[Word] = []
-        seen: set[str] = set()
         for offset in range(3):
-            dict_num = self.current_level + offset
             # clamp to 20
-            if dict_num > 20:
-                dict_num = 20
-            attempts = 0
-            chosen: Optional[Word] = None
-            while attempts < 10:
-                candidate = self.get_random_from_dict(dict_num)
-                if candidate.word not in seen:
-                    chosen = candidate
-                    break
-                attempts += 1
-            # if duplicate persisted, accept last candidate
-            if chosen is None:
-                chosen = candidate
-            words.append(chosen)
-            seen.add(chosen.word)
+            dict_num = min(self.current_level + offset, 20)
+            words.append(self.get_random_from_dict(dict_num))
         return words
 
     def _apply_correct_increment(self) -> bool:
@@ -170,11 +342,16 @@ class WordManager:
         Returns True if the difficulty level was increased.
         """
         self._global_corrects += 1
+        if self.progression == "score":
+            return self._increment_score()
         if self._global_corrects >= self.difficulty_threshold:
             increased = self._increment_level()
             if increased:
                 self._global_corrects = 0
                 return True
+        elif self.windowed and self._global_corrects >= self.difficulty_threshold - self.prefetch_margin:
+            # Level-up is close: load the level that will enter the window next
+            self._prefetch(self.current_level + 2)
         return False
 
     # ------------------ Progression ------------------
@@ -183,9 +360,38 @@ class WordManager:
         """Increment base difficulty level by 1 (keeping triple adjacency). Returns True if changed."""
         if self.current_level < self.max_level:
             self.current_level += 1
+            if self.windowed:
+                self._update_window()
             return True
         return False
 
+    def _target_score(self) -> int:
+        """Current target score, starting at the easiest word of the start level."""
+        if self.current_score is None:
+            index = self.score_index()
+            start = index.level_min_scores[self._start_level - 1]
+            self.current_score = index.min_score if start is None else start
+        return self.current_score
+
+    def _increment_score(self) -> bool:
+        """Raise the target score by `score_step` and keep `current_level` on the level holding it.
+
+        Returns True if the level containing the target score changed.
+        """
+        index = self.score_index()
+        self.current_score = min(self._target_score() + self.score_step, index.max_score)
+        level = self.min_level
+        for idx, low in enumerate(index.level_min_scores):
+            if low is not None and low <= self.current_score:
+                level = idx + 1
+        level = min(level, self.max_level)
+        if level == self.current_level:
+            return False
+        self.current_level = level
+        if self.windowed:
+            self._update_window()
+        return True
+
     # ------------------ Utilities ------------------
     def get_status(self) -> Dict[str, object]:
         """Return diagnostic information for UI/logging."""
@@ -193,9 +399,18 @@ class WordManager:
             "current_level": self.current_level,
             "difficulty_threshold": self.difficulty_threshold,
             "global_corrects": self._global_corrects,
+            "score_bias": self._score_bias,
+            "progression": self.progression,
+            "current_score": self.current_score,
+            "resident_levels": [i + 1 for i, level in enumerate(self.dicts) if level is not None],
         }
 
     def reset_progress(self) -> None:
         """Reset pull/correct counters and set level back to minimum."""
         self._global_corrects = 0
         self.current_level = self.min_level
+        self.current_score = None
+        self._drawn_positions.clear()
+        self._start_level = self.min_level
+        if self.windowed:
+            self._update_window()
@@ -0,0 +1,109 @@
+"""Word Matcher Class
+
+Incremental matcher for the typed input buffer. The active cloud words are compiled into a
+trie and the matcher advances one node per typed character, so every keystroke is answered
+in O(1) instead of comparing the whole buffer against every word.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from .word import Word
+
+
+class WordMatcher:
+    MATCH = "match"    # buffer equals one of the words
+    PREFIX = "prefix"  # buffer is a prefix of at least one word (including the empty buffer)
+    DEAD = "dead"      # buffer cannot be completed to any word
+
+    def __init__(self, words: Iterable[Word] = ()):
+        """Initialize the matcher over `words` with an empty buffer."""
+        self.reset(words)
+
+    def reset(self, words: Iterable[Word]) -> None:
+        """Rebuild the trie for a new set of words and clear the buffer."""
+        # Node 0 is the root; each node stores its children, the word ending there and the words below it
+        self._children: List[Dict[str, int]] = [{}]
+        self._ends: List[Optional[Word]] = [None]
+        live: List[List[Word]] = [[]]
+        for word in words:
+            node = 0
+            live[0].append(word)
+            for ch in word.word:
+                nxt = self._children[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._children)
+                    self._children[node][ch] = nxt
+                    self._children.append({})
+                    self._ends.append(None)
+                    live.append([])
+                node = nxt
+                live[node].append(word)
+            # keep the first word when two clouds share the same text
+            if self._ends[node] is None:
+                self._ends[node] = word
+        self._live: List[Tuple[Word, ...]] = [tuple(ws) for ws in live]
+        self._live_text: List[FrozenSet[str]] = [frozenset(w.word for w in ws) for ws in live]
+        self.clear()
+
+    def clear(self) -> None:
+        """Clear the typed buffer."""
+        self._path: List[int] = [0]
+        self._dead = 0  # characters typed after the buffer stopped matching
+
+    def push(self, ch: str) -> str:
+        """Advance by one typed character and return the new status."""
+        if not self._dead:
+            nxt = self._children[self._path[-1]].get(ch)
+            if nxt is not None:
+                self._path.append(nxt)
+                return self.status
+        self._dead += 1
+        return self.DEAD
+
+    def feed(self, text: str) -> str:
+        """Advance by every character in `text` and return the new status."""
+        for ch in text:
+            self.push(ch)
+        return self.status
+
+    def pop(self) -> str:
+        """Undo the last typed character (backspace) and return the new status."""
+        if self._dead:
+            self._dead -= 1
+        elif len(self._path) > 1:
+            self._path.pop()
+        return self.status
+
+    def match(self, text: str) -> Optional[Word]:
+        """Return the word equal to `text` without touching the buffer, or None."""
+        node = 0
+        for ch in text:
+            node = self._children[node].get(ch)
+            if node is None:
+                return None
+        return self._ends[node]
+
+    @property
+    def status(self) -> str:
+        """Status of the current buffer: MATCH, PREFIX or DEAD."""
+        if self._dead:
+            return self.DEAD
+        return self.MATCH if self._ends[self._path[-1]] is not None else self.PREFIX
+
+    @property
+    def matched_word(self) -> Optional[Word]:
+        """The word the buffer equals, or None."""
+        return None if self._dead else self._ends[self._path[-1]]
+
+    @property
+    def live_words(self) -> Tuple[Word, ...]:
+        """Words that still start with the buffer."""
+        return () if self._dead else self._live[self._path[-1]]
+
+    def progress_of(self, text: str) -> int:
+        """Number of typed characters matching `text`, or 0 if the buffer is not a prefix of it."""
+        if self._dead:
+            return 0
+        node = self._path[-1]
+        return len(self._path) - 1 if text in self._live_text[node] else 0
@@ -0,0 +1,109 @@
+"""Word Sampler Classes
+
+Non-repeating sampling of word indices within one level. The index permutation is shuffled
+lazily with an incremental Fisher–Yates: each draw swaps one random remaining index into the
+cursor position, so a draw is O(1), never retries, and no index repeats until every index of
+the level has been drawn once.
+
+Score-weighted sampling groups a level's words by score once, then picks a score bucket from
+an alias table and a word from that bucket's shuffled sampler, which is also O(1) per draw.
+"""
+
+from __future__ import annotations
+
+import random
+from array import array
+from typing import Callable, List, Optional, Sequence
+
+
+class ShuffledSampler:
+    __slots__ = ("size", "_order", "_cursor")
+
+    def __init__(self, size: int):
+        """Initialize a sampler over indices `0..size-1`; the index array is only allocated on first draw."""
+        self.size = size
+        self._order: Optional[array] = None
+        self._cursor = 0
+
+    @property
+    def remaining(self) -> int:
+        """Indices left before the level is exhausted and a new pass starts."""
+        return self.size - self._cursor
+
+    def draw(self, rand: random.Random) -> int:
+        """Return the next index of the shuffled permutation using `rand`."""
+        if self.size <= 0:
+            raise IndexError("cannot sample from an empty level")
+        if self._order is None:
+            self._order = array("I", range(self.size))
+        if self._cursor >= self.size:
+            # Level exhausted: continue shuffling the same array for a fresh pass
+            self._cursor = 0
+        order, cursor = self._order, self._cursor
+        j = rand.randrange(cursor, self.size)
+        order[cursor], order[j] = order[j], order[cursor]
+        self._cursor = cursor + 1
+        return order[cursor]
+
+
+class AliasTable:
+    """Walker/Vose alias table for O(1) draws from a fixed discrete distribution."""
+
+    __slots__ = ("_prob", "_alias")
+
+    def __init__(self, weights: Sequence[float]):
+        """Build the table from non-negative `weights`; all-zero weights fall back to uniform."""
+        n = len(weights)
+        if n == 0:
+            raise ValueError("cannot build an alias table without weights")
+        total = float(sum(weights))
+        if total <= 0:
+            weights, total = [1.0] * n, float(n)
+        scaled = [w * n / total for w in weights]
+        self._prob = array("d", [1.0] * n)
+        self._alias = array("I", range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # leftovers are 1.0 up to rounding error and keep their default entries
+
+    def draw(self, rand: random.Random) -> int:
+        """Return an index with probability proportional to its weight."""
+        i = rand.randrange(len(self._prob))
+        return i if rand.random() < self._prob[i] else self._alias[i]
+
+
+class ScoreWeightedSampler:
+    """Draws word indices of one level with probability proportional to a per-score weight."""
+
+    def __init__(self, scores: Sequence[int]):
+        """Group the level's word indices by score. Built once per level in O(n)."""
+        buckets: dict[int, List[int]] = {}
+        for i in range(len(scores)):
+            buckets.setdefault(scores[i], []).append(i)
+        self.scores = sorted(buckets)
+        self._members = array("I")
+        self._starts = array("I")
+        self._samplers: List[ShuffledSampler] = []
+        for score in self.scores:
+            self._starts.append(len(self._members))
+            self._members.extend(buckets[score])
+            self._samplers.append(ShuffledSampler(len(buckets[score])))
+        self._table: Optional[AliasTable] = None
+
+    def set_weight(self, weight: Callable[[int], float]) -> None:
+        """Rebuild the bucket alias table for a per-word `weight(score)`. O(number of distinct scores)."""
+        self._table = AliasTable([weight(score) * sampler.size
+                                  for score, sampler in zip(self.scores, self._samplers)])
+
+    def draw(self, rand: random.Random) -> int:
+        """Return a level index, choosing the score bucket by weight and the word without repeats."""
+        if self._table is None:
+            raise RuntimeError("set_weight must be called before drawing")
+        b = self._table.draw(rand)
+        return self._members[self._starts[b] + self._samplers[b].draw(rand)]
@@ -0,0 +1,70 @@
+"""Word Store Class
+
+Compact, column-oriented storage for one sub-dictionary: every word is packed into a single
+UTF-8 buffer with an offset array marking where each word ends, next to an unsigned 16-bit
+score column. This replaces one `(str, int)` tuple per word with three flat buffers.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Sequence, Tuple
+
+MAX_SCORE = 0xFFFF
+
+
+class WordColumn:
+    """Sequence of `(word, score)` pairs backed by a word buffer, an offset array and a score column.
+
+    Word `i` is `blob[offsets[first + i]:offsets[first + i + 1]]`, so several columns can share the
+    buffers of one dictionary pack by using different `first` values.
+    """
+
+    __slots__ = ("_blob", "_offsets", "_scores", "_first", "_count")
+
+    def __init__(self, blob: bytes | memoryview, offsets: Sequence[int], scores: Sequence[int],
+                 first: int = 0, count: int | None = None):
+        self._blob = blob
+        self._offsets = offsets
+        self._scores = scores
+        self._first = first
+        self._count = len(scores) - first if count is None else count
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Tuple[str, int]]) -> "WordColumn":
+        """Build a column from `(word, score)` pairs; scores are clamped to 0..65535."""
+        blob = bytearray()
+        offsets = array("I", [0])
+        scores = array("H")
+        for word, score in entries:
+            blob += word.encode("utf-8")
+            offsets.append(len(blob))
+            scores.append(min(max(score, 0), MAX_SCORE))
+        return cls(bytes(blob), offsets, scores)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _index(self, i: int) -> int:
+        if i < 0:
+            i += self._count
+        if not (0 <= i < self._count):
+            raise IndexError("word index out of range")
+        return self._first + i
+
+    def word_at(self, i: int) -> str:
+        """Decode word `i`."""
+        j = self._index(i)
+        return str(self._blob[self._offsets[j]:self._offsets[j + 1]], "utf-8")
+
+    def score_at(self, i: int) -> int:
+        """Score of word `i`."""
+        return self._scores[self._index(i)]
+
+    def scores(self) -> Sequence[int]:
+        """The score column of this level, without copying when backed by a pack."""
+        return self._scores[self._first:self._first + self._count]
+
+    def __getitem__(self, i: int) -> Tuple[str, int]:
+        j = self._index(i)
+        return str(self._blob[self._offsets[j]:self._offsets[j + 1]], "utf-8"), self._scores[j]
@@ -0,0 +1,53 @@
+"""Vectorized dictionary scoring must match the reference score_word/normalize_scores exactly"""
+import glob
+import os
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+import Dictionary_Script as ds
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def corpus_words() -> list[str]:
+    """Every word in the shipped sub-dictionaries"""
+    words = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "dictionaries", "subdict_*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            words.extend(line.split("|", 1)[0].strip() for line in f if line.strip())
+    return words
+
+
+def random_words(count: int = 5000, seed: int = 1) -> list[str]:
+    """Mixed-case ASCII words, punctuation, non-ASCII letters and edge cases"""
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ-'. 0123456789éüßøñ"
+    words = ["", "a", "aa", "qp", "Zx", "naïve", "東京", "x" * 50]
+    words += ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 20))) for _ in range(count)]
+    return words
+
+
+@pytest.mark.parametrize("words", [corpus_words(), random_words()], ids=["corpus", "random"])
+def test_score_words_vectorized_matches_score_word(words):
+    assert ds.score_words_vectorized(words) == [ds.score_word(word) for word in words]
+
+
+def test_score_words_process_pool_matches_score_word(monkeypatch):
+    words = random_words(2000, seed=2)
+    monkeypatch.setattr(ds, "PARALLEL_MIN_WORDS", 0)
+    assert ds.score_words(words, workers=2) == [ds.score_word(word) for word in words]
+
+
+@pytest.mark.parametrize("words", [corpus_words(), random_words()], ids=["corpus", "random"])
+def test_normalize_scores_vectorized_matches_normalize_scores(words):
+    raw = [ds.score_word(word) for word in words]
+    assert ds.normalize_scores_vectorized(raw) == ds.normalize_scores(raw)
+
+
+def test_normalize_scores_vectorized_with_fixed_bounds():
+    raw = [ds.score_word(word) for word in random_words(500, seed=3)]
+    lo, hi = min(raw) - 7, max(raw) + 13
+    assert ds.normalize_scores_vectorized(raw, raw_min=lo, raw_max=hi) == ds.normalize_scores(raw, raw_min=lo, raw_max=hi)
+    assert ds.normalize_scores_vectorized([42, 42]) == ds.normalize_scores([42, 42])
@@ -0,0 +1,89 @@
+"""Opening a leaderboard.db made by earlier versions of the game upgrades it in place without losing rows"""
+import sqlite3
+
+import pytest
+
+from models import Leaderboard, Record
+from models.leaderboard import SCHEMA_VERSION
+
+# Schema and rows as written by the game before the schema was versioned
+LEGACY_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+LEGACY_ROWS = [
+    ("ann", 300, "2024-05-01 10:00:00"),
+    ("bob", 900, "2024-05-01 10:00:05"),
+    ("ann", 300, "2024-05-01 10:00:00"),  # two games in the same second
+    ("cy", 600, "2024-05-02 08:30:00"),
+]
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    path = str(tmp_path / "leaderboard.db")
+    conn = sqlite3.connect(path)
+    conn.execute(LEGACY_SCHEMA)
+    conn.executemany("INSERT INTO records (username, score, timestamp) VALUES (?, ?, ?)", LEGACY_ROWS)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def read_db(path: str):
+    conn = sqlite3.connect(path)
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(records)")}
+        rows = conn.execute("SELECT username, score, timestamp FROM records ORDER BY id").fetchall()
+        return version, indexes, rows
+    finally:
+        conn.close()
+
+
+def test_legacy_database_is_upgraded_in_place(legacy_db):
+    leaderboard = Leaderboard(legacy_db)
+    try:
+        assert [(r.username, r.score) for r in leaderboard.get_top_records()] == [
+            ("bob", 900), ("cy", 600), ("ann", 300), ("ann", 300)]
+        assert leaderboard.rank_of(300) == 3
+        journal_mode = leaderboard._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        leaderboard.close()
+    version, indexes, rows = read_db(legacy_db)
+    assert version == SCHEMA_VERSION
+    assert {"idx_records_score", "idx_records_identity"} <= indexes
+    assert rows == LEGACY_ROWS
+    assert journal_mode == "wal"
+
+
+def test_upgraded_database_keeps_working(legacy_db):
+    Leaderboard(legacy_db).close()
+    leaderboard = Leaderboard(legacy_db)
+    try:
+        leaderboard.add_record(Record("ann", 300))
+        leaderboard.add_record(Record("ann", 300))
+        leaderboard.flush()
+        assert leaderboard.rank_of(299) == len(LEGACY_ROWS) + 3
+    finally:
+        leaderboard.close()
+    version, _, rows = read_db(legacy_db)
+    assert version == SCHEMA_VERSION
+    assert rows[:len(LEGACY_ROWS)] == LEGACY_ROWS
+    assert len(rows) == len(LEGACY_ROWS) + 2
+
+
+def test_standings_are_read_from_the_score_index(legacy_db):
+    Leaderboard(legacy_db).close()
+    conn = sqlite3.connect(legacy_db)
+    try:
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT username, score, id FROM records "
+                            "ORDER BY score DESC, id ASC LIMIT 10").fetchall()
+    finally:
+        conn.close()
+    assert any("idx_records_score" in row[-1] for row in plan)
+    assert not any("TEMP B-TREE" in row[-1] for row in plan)
@@ -1,4 +1,8 @@
 """Views Model Definition"""
 from .graphics import Graphics
 from .button import Button
-from .platform import Platform
\ No newline at end of file
+from .platform import Platform
+from .text_cache import TextCache, TEXT_CACHE, get_font
+from .ui_layout import ScreenLayout
+from .hud import Hud, HudText
+from .placement import OccupancyGrid, find_free_position
\ No newline at end of file
@@ -1,5 +1,6 @@
 """Button Class"""
 import pygame
+from .text_cache import TEXT_CACHE
 
 class Button:
     def __init__(self, name: str, x: int, y: int, w: int, h: int, image: pygame.Surface):
@@ -23,8 +24,13 @@ class Button:
 
     def is_clicked(self, event: pygame.event.Event) -> bool:
         """Check if button was clicked"""
+        return self.contains(event.pos)
+
+
+    def contains(self, pos: tuple[int, int]) -> bool:
+        """Check if a point lies on the button's visible pixels"""
         # Mouse Coordinates
-        mx, my = event.pos
+        mx, my = pos
 
         # Rectangle Check
         if not self.rect.collidepoint(mx, my):
@@ -36,8 +42,8 @@ class Button:
         # Pixel Perfect Check
         return self.mask.get_at((lx, ly)) == 1
     
-    def render_text_center(self, text: str, font: pygame.font.Font, surface: pygame.Surface):
+    def render_text_center(self, text: str, font_size: int, surface: pygame.Surface):
         """Render Text Centered on Button"""
-        text_surf = font.render(text, True, (255, 255, 255))
+        text_surf = TEXT_CACHE.render(text, font_size, (255, 255, 255))
         text_rect = text_surf.get_rect(center = self.rect.center)
         surface.blit(text_surf, text_rect)
\ No newline at end of file
@@ -2,6 +2,8 @@
 import pygame
 from .platform import Platform
 
+SPEED = 720  # pixels per second
+
 class Character:
     def __init__(self, screen: pygame.Surface, image: pygame.Surface):
         """Initialize Character"""
@@ -9,13 +11,22 @@ class Character:
         self.x, self.y = 0, 0
         self.image = pygame.transform.scale(image, (self.width, self.height))
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        self.prev_pos = self.rect.topleft  # where the rect was before the last simulation step
         self.attatched = False
         self.target_platform = None
 
 
-    def draw(self, screen: pygame.Surface):
-        """Draw the Character"""
-        screen.blit(self.image, self.rect)
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
+        """Draw the Character `alpha` of the way from its previous to its current position, return the screen area it covers"""
+        if alpha >= 1:
+            return screen.blit(self.image, self.rect)
+        px, py = self.prev_pos
+        return screen.blit(self.image, (round(px + (self.rect.x - px) * alpha), round(py + (self.rect.y - py) * alpha)))
+
+
+    def reset_interpolation(self):
+        """Draw at the current position from now on, without interpolating from the previous one"""
+        self.prev_pos = self.rect.topleft
 
     
     def update_platform(self, platform: Platform):
@@ -24,8 +35,9 @@ class Character:
         self.target_platform = platform
     
 
-    def update_position(self):
-        """Update the Position of the Character"""
+    def update_position(self, dt: float = 1 / 60):
+        """Advance the Character by one `dt` second simulation step"""
+        self.prev_pos = self.rect.topleft
         if self.attatched:
             self.teleport_to_platform()
             return
@@ -33,11 +45,12 @@ class Character:
         dx = self.target_platform.x + (self.target_platform.width - self.width) // 2 - self.x
         dy = self.target_platform.y - (self.height + self.target_platform.height) // 6 - self.y
         dist = (dx * dx + dy * dy) ** 0.5
-        if dist <= 12:
+        step = SPEED * dt
+        if dist <= step:
             self.teleport_to_platform()
         else:
-            self.x += dx / dist * 12
-            self.y += dy / dist * 12
+            self.x += dx / dist * step
+            self.y += dy / dist * step
             self.rect.topleft = (self.x, self.y)
 
 
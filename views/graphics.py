@@ -1,17 +1,21 @@
 """Graphics Class"""
+import random
 import pygame
 from models import Record, Word, Game
 from .button import Button
 from .platform import Platform
 from .character import Character
+from .hud import Hud
+from .text_cache import TEXT_CACHE, get_font
+from .ui_layout import ScreenLayout
 from utils import resource_path
 
 class Assets:
     """Asset Class to Load and store Game Assets"""
     def __init__(self, W, H):
         """Load and Scale all Assets to Screen Size"""
-        pygame.font.init()
-        self.font = pygame.font.Font(resource_path("assets/Kenney Mini.ttf"), 18)
+        self.font_size = 18
+        self.font = get_font(self.font_size)
         self.background = pygame.image.load(resource_path("assets/background.png")).convert_alpha()
         self.main_menu = pygame.image.load(resource_path("assets/main-menu.png")).convert_alpha()
         self.leaderboard_icon = pygame.image.load(resource_path("assets/leaderboard-icon.png")).convert_alpha()
@@ -27,141 +31,211 @@ class Assets:
             self.cloud, (platform_w, platform_h)
         )
 
+        # Scaled copies of assets keyed by (asset name, target size), valid for one display size
+        self._scaled: dict[tuple[str, tuple], pygame.Surface] = {}
+        self._scaled_for = (W, H)
+
+
+    def scaled(self, name: str, size: tuple) -> pygame.Surface:
+        """Return asset `name` scaled to `size`, scaling it only the first time it is requested"""
+        key = (name, size)
+        surface = self._scaled.get(key)
+        if surface is None:
+            surface = pygame.transform.scale(getattr(self, name), size)
+            self._scaled[key] = surface
+        return surface
+
+
+    def set_display_size(self, W, H):
+        """Drop cached scaled assets when the display size changes"""
+        if (W, H) != self._scaled_for:
+            self._scaled.clear()
+            self._scaled_for = (W, H)
+
 class Graphics:
-    def __init__(self): 
+    def __init__(self, dirty_rects: bool = True, seed: int = None):
+        """Create the Window. With `dirty_rects`, only changed regions are redrawn and pushed to the display.
+        `seed` makes platform layouts reproducible"""
         self.W, self.H = pygame.display.Info().current_h * 0.8 / 1.5, pygame.display.Info().current_h * 0.8
         self.screen = pygame.display.set_mode((self.W, self.H))
         pygame.display.set_caption("Type Up! Client")
 
         self.current_platform = None
         self.dx, self.dy = 0, 0
+        self.rng = random.Random(seed)
 
         self.assets = Assets(self.W, self.H)
+        self.display_size = self.screen.get_size()
         self.buttons: list[Button] = []
+        self.layout: ScreenLayout = None            # layout of the screen currently shown
+        self.layouts: dict[tuple, ScreenLayout] = {}  # (screen, display size) -> layout, built on first use
         self.platforms: list[Platform] = []
         self.character = Character(self.screen, self.assets.character)
+        self.hud = Hud(self.assets.font_size)
+
+        # Dirty-rect rendering: static screens are drawn once, the game screen only repaints what changed
+        self.dirty_rects = dirty_rects
+        self.scene = None               # key of what is currently on screen
+        self.drawn: dict = {}           # game screen element -> (screen area, appearance) from the last frame
+        self.dirty: list[pygame.Rect] = []
+        self.full_update = True
 
 
     # Functions for Rendering States Onto the Screen
     def render_main_menu(self, difficulty: int):
         """Render the Main Menu onto the Screen"""
-        self.buttons = []
+        self.check_display_size()
+        if not self.begin_static_scene(("menu", difficulty)):
+            return
+        layout = self.use_layout("menu", self.build_main_menu_buttons)
 
         # Fill Background
-        bg = pygame.transform.scale(self.assets.main_menu, (self.W, self.H))
+        bg = self.assets.scaled("main_menu", (self.W, self.H))
         self.screen.blit(bg, (0, 0))
 
-        # Create Buttons
+        # Draw Buttons
+        layout.draw(self.screen)
+
+        # Difficulty Label, the only part of the menu that changes
+        diff_text = None
+        if difficulty == 1:
+            diff_text = "easy"
+        elif difficulty == 2:
+            diff_text = "medium"
+        else:
+            diff_text = "hard"
+        layout.get("difficulty").render_text_center(diff_text, self.assets.font_size, self.screen)
+
+
+    def build_main_menu_buttons(self) -> list[Button]:
+        """Create the Main Menu Buttons for the current screen size"""
+        buttons = []
 
         # Play Button
         button_w, button_h = self.banner_size()
         play_x, play_y = self.W // 2 - button_w // 2, self.H - (self.H // 6) - button_h // 3
-        self.buttons.append(Button("play", play_x, play_y, button_w, button_h, self.assets.play))
+        buttons.append(Button("play", play_x, play_y, button_w, button_h, self.assets.play))
 
         # Leaderboard Button
         button_w, button_h = self.small_button_size()
         record_x, record_y = self.anchor_top_right(self.W, button_w)
-        self.buttons.append(Button("leaderboard", record_x, record_y, button_w, button_h, self.assets.leaderboard_icon))
+        buttons.append(Button("leaderboard", record_x, record_y, button_w, button_h, self.assets.leaderboard_icon))
 
         # Difficulty Button
         button_w, button_h = self.banner_size()
         diff_x, diff_y = play_x, self.H - (self.H // 2) - button_h // 3
-        diff_text = None
-        if difficulty == 1:
-            diff_text = "easy"
-        elif difficulty == 2:
-            diff_text = "medium"
-        else:
-            diff_text = "hard"
-        diff = Button("difficulty", diff_x, diff_y, button_w, button_h, self.assets.record_card)
-        self.buttons.append(diff)
+        buttons.append(Button("difficulty", diff_x, diff_y, button_w, button_h, self.assets.record_card))
+        return buttons
 
-        # Draw Buttons
-        for button in self.buttons:
-            button.draw(self.screen)
 
-        diff.render_text_center(diff_text, self.assets.font, self.screen)
-            
     
     def render_pause_menu(self):
-        self.buttons = []
+        self.check_display_size()
+        if not self.begin_static_scene(("pause",)):
+            return
+        layout = self.use_layout("pause", self.build_pause_menu_buttons)
 
         # Fill Background
-        bg = pygame.transform.scale(self.assets.background, (self.W, self.H))
+        bg = self.assets.scaled("background", (self.W, self.H))
         self.screen.blit(bg, (0, 0))
 
         # Add Pause Card
         pause_width, pause_height = self.W * 0.6, self.W * 0.9
         pause_x, pause_y = self.W * 0.2, self.H * 0.2
-        pause = pygame.transform.scale(self.assets.leaderboard, (pause_width, pause_height))
+        pause = self.assets.scaled("leaderboard", (pause_width, pause_height))
 
         self.screen.blit(pause, (pause_x, pause_y))
 
+        # Draw Buttons
+        for button in layout.buttons:
+            button.draw(self.screen)
+            button.render_text_center(button.name, self.assets.font_size, self.screen)
+
+
+    def build_pause_menu_buttons(self) -> list[Button]:
+        """Create the Pause Menu Buttons for the current screen size"""
+        buttons = []
+        pause_y = self.H * 0.2
+
         # Resume Button
         button_w, button_h = self.banner_size()
         resume_x, resume_y = self.W // 2 - button_w // 2, pause_y + button_h
-        self.buttons.append(Button("resume", resume_x, resume_y, button_w, button_h, self.assets.record_card))
+        buttons.append(Button("resume", resume_x, resume_y, button_w, button_h, self.assets.record_card))
 
         # End Game Button
         button_w, button_h = self.banner_size()
         end_x, end_y = resume_x, resume_y + button_h * 1.5
-        self.buttons.append(Button("end", end_x, end_y, button_w, button_h, self.assets.record_card))
-        
-        # Draw Buttons
-        for button in self.buttons:
-            button.draw(self.screen)
-            button.render_text_center(button.name, self.assets.font, self.screen)
+        buttons.append(Button("end", end_x, end_y, button_w, button_h, self.assets.record_card))
+        return buttons
 
 
-    def render_game(self, game: Game, input: str):
-        self.buttons = []
+    def render_game(self, game: Game, input: str, alpha: float = 1.0):
+        """Render the Game, drawing moving elements `alpha` of the way through the current simulation step"""
+        self.check_display_size()
+        self.use_layout("play", list)
 
-        # Fill Background
-        bg = pygame.transform.scale(self.assets.background, (self.W, self.H))
-        self.screen.blit(bg, (0, 0))
+        # Fill Background, or in dirty-rect mode only erase what was drawn over it last frame
+        bg = self.assets.scaled("background", (self.W, self.H))
+        full = not self.dirty_rects or self.scene != "play"
+        if full:
+            self.screen.blit(bg, (0, 0))
+        else:
+            for rect, _ in self.drawn.values():
+                self.screen.blit(bg, rect, rect)
+        self.scene = "play"
+        drawn = {}
 
-        # Render Text
-        score_text = self.assets.font.render(f"Score: {game.score}", True, (0, 0, 0))
-        input_text = self.assets.font.render(f"{input}", True, (0, 0, 0))
-        time_text = self.assets.font.render(f"Time: {int(game.remaining_time)}", True, (0, 0, 0))
+        # Render Text, only for the HUD values that changed since the last frame
+        hud = self.hud
+        hud.update(game.score, game.remaining_time, input)
+        score_text, input_text, time_text = hud.score.surface, hud.input.surface, hud.time.surface
 
         # Display Text
-        self.screen.blit(score_text, self.anchor_top_left())
-        self.screen.blit(input_text, self.anchor_top_middle(self.W, input_text.get_width()))
-        self.screen.blit(time_text, self.anchor_top_right(self.W, time_text.get_width()))
+        drawn["score"] = (self.screen.blit(score_text, self.anchor_top_left()), hud.score.value)
+        drawn["input"] = (self.screen.blit(input_text, self.anchor_top_middle(self.W, input_text.get_width())), hud.input.value)
+        drawn["time"] = (self.screen.blit(time_text, self.anchor_top_right(self.W, time_text.get_width())), hud.time.value)
 
-        # Draw Platforms
+        # Draw Platforms, highlighting the typed prefix of words still matching the input
         for platform in self.platforms:
-            platform.draw(self.screen)
+            progress = game.matcher.progress_of(platform.word)
+            drawn[platform] = (platform.draw(self.screen, progress, alpha), (platform.word, progress))
 
         # Draw the Character
-        self.character.draw(self.screen)
+        drawn["character"] = (self.character.draw(self.screen, alpha), None)
+
+        if full:
+            self.full_update = True
+        else:
+            # Push only elements that moved or changed appearance, at both their old and new positions
+            for key in self.drawn.keys() | drawn.keys():
+                old, new = self.drawn.get(key), drawn.get(key)
+                if old != new:
+                    self.dirty.extend(entry[0] for entry in (old, new) if entry is not None)
+        self.drawn = drawn
 
 
-    def render_leaderboard(self, records: list[Record]):
-        """Render Leaderboard"""
-        self.buttons = []
+    def render_leaderboard(self, records: list[Record], placement: int = None):
+        """Render Leaderboard, with the player's placement below the records if given"""
+        self.check_display_size()
+        if not self.begin_static_scene(("leaderboard", tuple((r.username, r.score) for r in records[:10]), placement)):
+            return
+        layout = self.use_layout("leaderboard", self.build_leaderboard_buttons)
 
         # Fill Background
-        bg = pygame.transform.scale(self.assets.background, (self.W, self.H))
+        bg = self.assets.scaled("background", (self.W, self.H))
         self.screen.blit(bg, (0, 0))
 
         # Add Leaderboard Card
         leaderboard_width, leaderboard_height = self.W * 0.8, self.W * 1.2
         leaderboard_x, leaderboard_y = self.W * 0.1, self.H * 0.1
-        leaderboard = pygame.transform.scale(self.assets.leaderboard, (leaderboard_width, leaderboard_height))
+        leaderboard = self.assets.scaled("leaderboard", (leaderboard_width, leaderboard_height))
 
         self.screen.blit(leaderboard, (leaderboard_x, leaderboard_y))
 
-        # Add Close Button
-        close_width, close_height = self.small_button_size()
-        close = pygame.transform.scale(self.assets.close, (close_width, close_height))
-        self.buttons.append(Button("close", (leaderboard_x + leaderboard_width - close_width * 2), (leaderboard_y - (close_width * 0.2 )), close_width, close_height, close))
-
         # Add Record Cards
         record_width, record_height = self.W * 0.7, self.H * 0.05
         record_spacing = self.H * 0.01
-        record_card = pygame.transform.scale(self.assets.record_card, (record_width, record_height))
+        record_card = self.assets.scaled("record_card", (record_width, record_height))
 
         for rank in range(min(10, len(records))):
             # Get the record data
@@ -173,9 +247,9 @@ class Graphics:
             self.screen.blit(record_card, (record_x, record_y))
 
             # Render Text
-            rank_text = self.assets.font.render(str(rank + 1), True, (255, 255, 255))
-            name_text = self.assets.font.render(record.username, True, (255, 255, 255))
-            score_text = self.assets.font.render(str(record.score), True, (255, 255, 255))
+            rank_text = TEXT_CACHE.render(str(rank + 1), self.assets.font_size, (255, 255, 255))
+            name_text = TEXT_CACHE.render(record.username, self.assets.font_size, (255, 255, 255))
+            score_text = TEXT_CACHE.render(str(record.score), self.assets.font_size, (255, 255, 255))
 
             # Display Text
             text_y = record_y + (record_height // 2) - (name_text.get_height() // 2)
@@ -184,22 +258,41 @@ class Graphics:
             self.screen.blit(name_text, (record_x + (record_width // 10), text_y))
             self.screen.blit(score_text, (self.W * 0.825 - score_text.get_width(), text_y))
 
-        for button in self.buttons:
-            button.draw(self.screen)
+        # Show where the last game placed
+        if placement is not None:
+            placement_text = TEXT_CACHE.render(f"You placed #{placement}", self.assets.font_size, (0, 0, 0))
+            placement_y = leaderboard_y + (leaderboard_height * 0.05) + (record_height + record_spacing) * 10
+            self.screen.blit(placement_text, placement_text.get_rect(midtop=(self.W // 2, placement_y)))
+
+        layout.draw(self.screen)
+
+
+    def build_leaderboard_buttons(self) -> list[Button]:
+        """Create the Leaderboard Buttons for the current screen size"""
+        leaderboard_width = self.W * 0.8
+        leaderboard_x, leaderboard_y = self.W * 0.1, self.H * 0.1
+
+        # Close Button
+        close_width, close_height = self.small_button_size()
+        close = self.assets.scaled("close", (close_width, close_height))
+        return [Button("close", (leaderboard_x + leaderboard_width - close_width * 2), (leaderboard_y - (close_width * 0.2 )), close_width, close_height, close)]
 
 
-    def render_end_game(self, score: int, input: str):
+    def render_end_game(self, score: int, input: str, placement: int = None):
         """Render End Game Screen"""
-        self.buttons = []
+        self.check_display_size()
+        if not self.begin_static_scene(("end", score, input, placement)):
+            return
+        self.use_layout("end", list)
 
         # Fill Background
-        bg = pygame.transform.scale(self.assets.background, (self.W, self.H))
+        bg = self.assets.scaled("background", (self.W, self.H))
         self.screen.blit(bg, (0, 0))
 
         # Add Leaderboard Card
         leaderboard_width, leaderboard_height = self.W * 0.8, self.W * 1.2
         leaderboard_x, leaderboard_y = self.W * 0.1, self.H * 0.1
-        leaderboard = pygame.transform.scale(self.assets.leaderboard, (leaderboard_width, leaderboard_height))
+        leaderboard = self.assets.scaled("leaderboard", (leaderboard_width, leaderboard_height))
 
         self.screen.blit(leaderboard, (leaderboard_x, leaderboard_y))
 
@@ -219,21 +312,73 @@ class Graphics:
         self.screen.blit(score_text, score_rect)
         self.screen.blit(prompt_text, prompt_rect)
 
+        if placement is not None:
+            placement_text = TEXT_CACHE.render(f"You placed #{placement}", self.assets.font_size, (0, 0, 0))
+            self.screen.blit(placement_text, placement_text.get_rect(center=(center_x, leaderboard_y + 85)))
+
+
+    def check_display_size(self):
+        """Invalidate scaled assets if the display surface changed size"""
+        size = self.screen.get_size()
+        if size != self.display_size:
+            self.display_size = size
+            self.W, self.H = size
+            self.assets.set_display_size(self.W, self.H)
+            self.layouts.clear()
+            self.scene = None
+
+
+    def use_layout(self, name: str, build) -> ScreenLayout:
+        """Make screen `name` the active layout, creating its Buttons with `build` once per display size"""
+        key = (name, self.display_size)
+        layout = self.layouts.get(key)
+        if layout is None:
+            layout = ScreenLayout(build())
+            self.layouts[key] = layout
+        self.layout = layout
+        self.buttons = layout.buttons
+        return layout
+
+
+    # Display Update Functions
+    def invalidate(self):
+        """Redraw and push the whole screen on the next render, e.g. after the window was uncovered"""
+        self.scene = None
+        self.full_update = True
+
+
+    def begin_static_scene(self, key) -> bool:
+        """Return False if `key` is already on screen and can be skipped, otherwise schedule a full update"""
+        if self.dirty_rects and key == self.scene:
+            return False
+        self.scene = key
+        self.full_update = True
+        return True
+
+
+    def present(self):
+        """Push this frame to the display: the whole screen, only the dirty rects, or nothing if unchanged"""
+        if not self.dirty_rects or self.full_update:
+            pygame.display.update()
+        elif self.dirty:
+            pygame.display.update(self.dirty)
+        self.full_update = False
+        self.dirty = []
+
 
     # Game Element Management Functions
     def check_button_clicked(self, event: pygame.event):
         """If event was mouse click, return clicked button if applicable"""
-        if event.type != pygame.MOUSEBUTTONDOWN:
+        if event.type != pygame.MOUSEBUTTONDOWN or self.layout is None:
             return None
-        
-        for button in self.buttons:
-            if button.is_clicked(event):
-                print(f"{button.name} was clicked.")
-                if button.name in ["easy", "medium", "hard"]:
-                    return "difficulty"
-                return button.name
-        
-        return None
+
+        button = self.layout.button_at(event.pos)
+        if button is None:
+            return None
+        print(f"{button.name} was clicked.")
+        if button.name in ["easy", "medium", "hard"]:
+            return "difficulty"
+        return button.name
 
     def init_game_elements(self, words: list[Word]):
         """Initialize Start of Game Elements"""
@@ -244,6 +389,7 @@ class Graphics:
         temp.rect.topleft = (temp.x, temp.y)
         self.character.update_platform(temp)
         self.character.teleport_to_platform()
+        self.character.reset_interpolation()
         self.current_platform = temp
         self.platforms.append(temp)
         self.add_words(words)
@@ -253,9 +399,12 @@ class Graphics:
         """Add Platforms for New Words"""
         for word in words:
             print(f"Adding Platform {word.word}")
-            platform = Platform(self.screen, self.assets.platform, word.word, self.platforms)
+            platform = Platform(self.screen, self.assets.platform, word.word, self.platforms, self.rng)
             platform.x += self.dx
             platform.y += self.dy
+            # Start drawing from the shifted spot, even if a frame renders before the next step
+            platform.rect.topleft = (platform.x, platform.y)
+            platform.reset_interpolation()
             self.platforms.append(platform)
 
 
@@ -283,14 +432,14 @@ class Graphics:
         for platform in self.platforms:
             platform.update_destination(-dx, -dy)
         
-    def move_platforms(self):
-        """Move Platforms toward their destination"""
+    def move_platforms(self, dt: float = 1 / 60):
+        """Advance Platforms and the Character by one `dt` second simulation step"""
         remaining = []
         for platform in self.platforms:
-            if platform.update_position(self.screen.get_width(), self.screen.get_height()):
+            if platform.update_position(self.screen.get_width(), self.screen.get_height(), dt):
                 remaining.append(platform)
         self.platforms = remaining
-        self.character.update_position()
+        self.character.update_position(dt)
 
 
     # Button Size Helpers
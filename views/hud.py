@@ -0,0 +1,44 @@
+"""HUD Class"""
+import pygame
+from .text_cache import get_font
+
+
+class HudText:
+    """One line of HUD text that keeps its surface until the displayed value changes"""
+    def __init__(self, size: int, color: tuple, template: str = "{}"):
+        self.size = size
+        self.color = color
+        self.template = template
+        self.value = None
+        self.surface: pygame.Surface = None
+
+
+    def update(self, value) -> bool:
+        """Set the displayed value, returning True if the text had to be rasterized again"""
+        if value == self.value and self.surface is not None:
+            return False
+        self.value = value
+        self.surface = get_font(self.size).render(self.template.format(value), True, self.color)
+        return True
+
+
+class Hud:
+    """Score, typed input and timer shown during play"""
+    def __init__(self, font_size: int = 18, color: tuple = (0, 0, 0)):
+        self.score = HudText(font_size, color, "Score: {}")
+        self.input = HudText(font_size, color)
+        self.time = HudText(font_size, color, "Time: {}")
+
+        # Profiling counters
+        self.rasterized = 0         # texts rasterized by the last update()
+        self.total_rasterized = 0   # texts rasterized since creation
+        self.frames = 0             # update() calls since creation
+
+
+    def update(self, score: int, remaining_time: float, input: str):
+        """Refresh the HUD for this frame, rasterizing only the texts whose value changed"""
+        # The timer shows whole seconds, so it changes once per second rather than every frame
+        changed = self.score.update(score) + self.input.update(input) + self.time.update(int(remaining_time))
+        self.rasterized = changed
+        self.total_rasterized += changed
+        self.frames += 1
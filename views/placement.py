@@ -0,0 +1,60 @@
+"""Platform Placement
+
+Finds a spot for a new platform that overlaps none of the existing ones, in bounded time.
+A few random positions are tried first, which keeps layouts varied and is almost always enough.
+If they all collide, every candidate position is checked. A rect that fits can be slid up and then
+left until it touches the area's edge or another rect, so the only positions worth checking are
+the area's top-left edges and the right and bottom edges of the occupied rects. That is at most
+(n + 1)^2 checks for n rects, and if none of them fits, no position does.
+"""
+import random
+import pygame
+
+
+class OccupancyGrid:
+    """Uniform grid over occupied rects, so an overlap test only looks at rects in the cells it covers"""
+    def __init__(self, rects: list[pygame.Rect], cell_w: int, cell_h: int):
+        self.cell_w, self.cell_h = max(1, cell_w), max(1, cell_h)
+        self._cells: dict[tuple[int, int], list[pygame.Rect]] = {}
+        for rect in rects:
+            for cell in self._cells_of(rect):
+                self._cells.setdefault(cell, []).append(rect)
+
+
+    def _cells_of(self, rect: pygame.Rect):
+        for cx in range(rect.left // self.cell_w, (rect.right - 1) // self.cell_w + 1):
+            for cy in range(rect.top // self.cell_h, (rect.bottom - 1) // self.cell_h + 1):
+                yield cx, cy
+
+
+    def collides(self, rect: pygame.Rect) -> bool:
+        """Check if `rect` overlaps any occupied rect"""
+        return any(rect.colliderect(other) for cell in self._cells_of(rect) for other in self._cells.get(cell, ()))
+
+
+def find_free_position(area: pygame.Rect, size: tuple[int, int], occupied: list[pygame.Rect],
+                       rng: random.Random = None, attempts: int = 16) -> tuple[int, int]:
+    """Return a random top-left position for a `size` rect inside `area` that overlaps none of `occupied`.
+
+    Returns None if there is no such position. `rng` makes the result reproducible; the `random`
+    module is used if it is not given.
+    """
+    rng = rng or random
+    w, h = size
+    # Range of top-left corners that keep the rect inside the area
+    x0, y0 = area.left, area.top
+    x1, y1 = area.right - w, area.bottom - h
+    if x1 < x0 or y1 < y0:
+        return None
+    grid = OccupancyGrid(occupied, w, h)
+
+    for _ in range(attempts):
+        x, y = rng.randint(x0, x1), rng.randint(y0, y1)
+        if not grid.collides(pygame.Rect(x, y, w, h)):
+            return x, y
+
+    # Crowded: check every candidate position and pick one of those that fit
+    xs = {x0} | {rect.right for rect in occupied if x0 <= rect.right <= x1}
+    ys = {y0} | {rect.bottom for rect in occupied if y0 <= rect.bottom <= y1}
+    free = [(x, y) for x in sorted(xs) for y in sorted(ys) if not grid.collides(pygame.Rect(x, y, w, h))]
+    return rng.choice(free) if free else None
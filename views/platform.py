@@ -1,52 +1,78 @@
 """Platform Class"""
 import pygame
 import random
-from utils import resource_path
+from .placement import find_free_position
+from .text_cache import TEXT_CACHE, get_font
+
+HIGHLIGHT_COLOR = (46, 139, 87)
 
 class Platform:
-    def __init__(self, screen: pygame.Surface, image: pygame.Surface, word: str, existing: list = []):
-        """Initialize Platform"""
+    def __init__(self, screen: pygame.Surface, image: pygame.Surface, word: str, existing: list = [], rng: random.Random = None):
+        """Initialize Platform at a free spot among `existing` platforms, chosen with `rng` if given"""
         self.image = image
         self.width, self.height = image.get_width(), image.get_height()
-        self.x, self.y = self.get_random_coords(screen, existing)
+        self.x, self.y = self.get_random_coords(screen, existing, rng)
         self.dest_x, self.dest_y = self.x, self.y
         self.word = word
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
-        self.speed = 12
+        self.prev_pos = self.rect.topleft  # where the rect was before the last simulation step
+        self.speed = 720  # pixels per second
+        self.fit_font()
+        self.word_surf = None
+        self.rendered_word = None
 
 
-    def draw(self, screen: pygame.Surface):
-        """Draw the Platform"""
-        screen.blit(self.image, self.rect)
-        self.render_word(screen)
+    def draw(self, screen: pygame.Surface, progress: int = 0, alpha: float = 1.0) -> pygame.Rect:
+        """Draw the Platform `alpha` of the way from its previous to its current position, return the screen area it covers"""
+        rect = self.rect if alpha >= 1 else self.image.get_rect(topleft=self.render_position(alpha))
+        drawn = screen.blit(self.image, rect)
+        return drawn.union(self.render_word(screen, progress, rect))
 
 
-    def render_word(self, screen: pygame.Surface):
-        """Render the word on the platform"""
-        self.fit_font()
-        word_surf = self.font.render(self.word, True, (0, 0, 0))
-        word_rect = word_surf.get_rect(center = self.rect.center)
-        screen.blit(word_surf, word_rect)
+    def render_position(self, alpha: float) -> tuple[int, int]:
+        """Interpolate between the positions before and after the last simulation step"""
+        px, py = self.prev_pos
+        return round(px + (self.rect.x - px) * alpha), round(py + (self.rect.y - py) * alpha)
+
+
+    def reset_interpolation(self):
+        """Draw at the current position from now on, without interpolating from the previous one"""
+        self.prev_pos = self.rect.topleft
+
+
+    def render_word(self, screen: pygame.Surface, progress: int = 0, rect: pygame.Rect = None) -> pygame.Rect:
+        """Render the word on the platform, highlighting the first `progress` typed characters"""
+        # Re-rasterize only when the word changes
+        if self.word != self.rendered_word:
+            self.word_surf = TEXT_CACHE.render(self.word, self.font_size, (0, 0, 0))
+            self.rendered_word = self.word
+        word_rect = self.word_surf.get_rect(center = (rect or self.rect).center)
+        drawn = screen.blit(self.word_surf, word_rect)
+
+        # Draw the typed prefix over the start of the word
+        if progress:
+            typed_surf = TEXT_CACHE.render(self.word[:progress], self.font_size, HIGHLIGHT_COLOR)
+            screen.blit(typed_surf, word_rect.topleft)
+        return drawn
 
 
     def fit_font(self):
         """Fit Font Size to Platform"""
-        font_size = self.height // 4
-        self.font = pygame.font.Font(resource_path("assets/Kenney Mini.ttf"), font_size)
+        self.font_size = self.height // 4
+        self.font = get_font(self.font_size)
     
 
-    def get_random_coords(self, screen: pygame.Surface, existing: list) -> tuple[int, int]:
-        """Get Random Coordinates for Platform"""
+    def get_random_coords(self, screen: pygame.Surface, existing: list, rng: random.Random = None) -> tuple[int, int]:
+        """Get Random Coordinates for Platform in the top half of the screen, clear of `existing` platforms"""
         W, H = screen.get_size()
-
-        while True: 
-            x = random.randint(0, W - self.width)
-            y = random.randint(H // 12, H // 2 - self.height)
-            
-            new_rect = pygame.Rect(x, y, self.width, self.height)
-
-            if not any(new_rect.colliderect(platform.rect) for platform in existing):
-                return x, y
+        area = pygame.Rect(0, H // 12, W, H // 2 - H // 12)
+        position = find_free_position(area, (self.width, self.height), [platform.rect for platform in existing], rng)
+        if position is None:
+            # No free spot left: overlap rather than leave the word without a platform
+            print("[Platform] No free space for a new platform, placing it over others")
+            rng = rng or random
+            position = rng.randint(0, max(0, W - self.width)), rng.randint(H // 12, max(H // 12, H // 2 - self.height))
+        return position
     
 
     def current_position(self) -> tuple[int, int]:
@@ -60,9 +86,10 @@ class Platform:
         self.dest_y += dy
 
 
-    def update_position(self, W: int, H: int) -> bool:
-        """Update the Position of the Platform, return False if moving offscreen"""
-        
+    def update_position(self, W: int, H: int, dt: float = 1 / 60) -> bool:
+        """Advance the Platform by one `dt` second simulation step, return False if moving offscreen"""
+        self.prev_pos = self.rect.topleft
+
         dx = self.dest_x - self.x
         dy = self.dest_y - self.y
 
@@ -72,7 +99,7 @@ class Platform:
 
         # Computer Remaining Distance to Move
         dist_squared = dx*dx + dy*dy
-        speed = self.speed
+        speed = self.speed * dt
         
         # If Close enough, snap to destination
         if dist_squared <= speed * speed:
@@ -0,0 +1,46 @@
+"""Text Cache Class"""
+from collections import OrderedDict
+import pygame
+from utils import resource_path
+
+FONT_PATH = "assets/Kenney Mini.ttf"
+
+_fonts: dict[int, pygame.font.Font] = {}
+
+
+def get_font(size: int) -> pygame.font.Font:
+    """Return the game font at `size`, loading the TTF from disk only once per size"""
+    font = _fonts.get(size)
+    if font is None:
+        pygame.font.init()
+        font = pygame.font.Font(resource_path(FONT_PATH), size)
+        _fonts[size] = font
+    return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (text, font size, color)"""
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.renders = 0  # total rasterizations, for profiling
+
+
+    def render(self, text: str, size: int, color: tuple) -> pygame.Surface:
+        """Return `text` rendered at `size` in `color`, rasterizing it only on a cache miss"""
+        key = (text, size, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+
+        surface = get_font(size).render(text, True, color)
+        self.renders += 1
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+        return surface
+
+
+# Shared by platforms, button labels and the leaderboard
+TEXT_CACHE = TextCache()
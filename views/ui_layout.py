@@ -0,0 +1,39 @@
+"""Screen Layout Class"""
+import pygame
+from .button import Button
+
+
+class ScreenLayout:
+    """The Buttons of one screen at one resolution, built once and indexed for click lookup"""
+    def __init__(self, buttons: list[Button], cell_size: int = 64):
+        self.buttons = buttons
+        self.cell_size = cell_size
+        self._by_name = {button.name: button for button in buttons}
+
+        # Uniform grid over the screen: each cell lists the buttons whose rect overlaps it
+        self._cells: dict[tuple[int, int], list[Button]] = {}
+        for button in buttons:
+            rect = button.rect
+            for cx in range(rect.left // cell_size, (rect.right - 1) // cell_size + 1):
+                for cy in range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1):
+                    self._cells.setdefault((cx, cy), []).append(button)
+
+
+    def get(self, name: str) -> Button:
+        """Return the Button called `name`"""
+        return self._by_name[name]
+
+
+    def button_at(self, pos: tuple[int, int]) -> Button:
+        """Return the Button under `pos`, checking only the buttons in that grid cell"""
+        x, y = pos
+        for button in self._cells.get((x // self.cell_size, y // self.cell_size), ()):
+            if button.contains(pos):
+                return button
+        return None
+
+
+    def draw(self, surface: pygame.Surface):
+        """Draw every Button"""
+        for button in self.buttons:
+            button.draw(surface)